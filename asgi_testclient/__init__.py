@@ -1 +1,9 @@
-from asgi_testclient.client import TestClient, HTTPError, WsDisconnect  # noqa
+from asgi_testclient.client import (  # noqa
+    TestClient,
+    HTTPError,
+    DecodingError,
+    WsDisconnect,
+    Timeout,
+    TooManyRedirects,
+    RedirectLoop,
+)
@@ -1,39 +1,116 @@
 import inspect
 import json as _json
-from asyncio import Queue, ensure_future, sleep
+from asyncio import (
+    CancelledError,
+    FIRST_COMPLETED,
+    Future,
+    Queue,
+    QueueFull,
+    TimeoutError,
+    ensure_future,
+    gather,
+    get_event_loop,
+    wait,
+    wait_for,
+)
 from http import HTTPStatus
-from urllib.parse import urlsplit, urlencode
-from wsgiref.headers import Headers as _Headers
-
+from datetime import timedelta
+from time import perf_counter
+from urllib.parse import urljoin, urlsplit, urlencode
+from weakref import WeakSet
+
+from asgi_testclient import fanout, load
+from asgi_testclient.hooks import (
+    HOOKS,
+    Hooks,
+    catch_exceptions,
+    default_hooks,
+    dispatch_hook,
+    wrap_channels,
+)
+from asgi_testclient.codec import JSONCodec, get_codec
+from asgi_testclient.content import Multipart, iter_content
+from asgi_testclient.cookies import CookieJar
+from asgi_testclient.encoding import Decoder, get_decoder
+from asgi_testclient.headers import HeaderMap, encode_headers
 from asgi_testclient.types import (
+    Any,
     Scope,
     Receive,
     Send,
     ASGI2App,
     ASGI3App,
     Message,
+    Body,
+    Content,
     Headers,
     Params,
     Url,
     ReqHeaders,
     ResHeaders,
     Optional,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
     List,
     Union,
     cast
 )
 
 DEFAULT_PORTS = {"http": 80, "ws": 80, "https": 443, "wss": 443}
+REDIRECT_CODES = (301, 302, 303, 307, 308)
 
 
 class HTTPError(Exception):
     pass
 
 
+class TooManyRedirects(HTTPError):
+    """ More than `max_redirects` redirects, `history` has every response. """
+
+    def __init__(self, message: str, history: List["Response"]) -> None:
+        super().__init__(message)
+        self.history = history
+
+
+class RedirectLoop(TooManyRedirects):
+    """ A redirect leads back to a request already made in the same state. """
+
+
+class DecodingError(HTTPError):
+    """ A response body doesn't match its `content-encoding`. """
+
+
 class WsDisconnect(Exception):
     pass
 
 
+class Timeout(TimeoutError):
+    """ A call didn't complete in time, `pending` tells what it waited on. """
+
+    def __init__(self, call: str, elapsed: float, pending: str) -> None:
+        super().__init__(f"{call} timed out after {elapsed:.3f}s waiting on {pending}")
+        self.call = call
+        self.elapsed = elapsed
+        self.pending = pending
+
+
+class SlowCalls(list):
+    """ Calls which took longer than `threshold` seconds, as (call, elapsed)
+        tuples. Nothing is recorded while `threshold` is None. """
+
+    def __init__(self, threshold: Optional[float] = None) -> None:
+        super().__init__()
+        self.threshold = threshold
+
+    def check(self, call: str, started: float) -> None:
+        if self.threshold is not None:
+            elapsed = perf_counter() - started
+            if elapsed > self.threshold:
+                self.append((call, elapsed))
+
+
 def is_asgi2(app: Union[ASGI2App, ASGI3App]) -> bool:
     if inspect.isclass(app):
         return True
@@ -53,21 +130,117 @@ class ASGI2to3:
         await instance(receive, send)
 
 
+class Timings:
+    """ `time.perf_counter` timestamps of the ASGI events of a request, None
+        until seen, and body sizes in both directions. """
+
+    def __init__(self) -> None:
+        self.app_call = perf_counter()
+        self.first_receive: Optional[float] = None
+        self.response_start: Optional[float] = None
+        self.first_body: Optional[float] = None
+        self.last_body: Optional[float] = None
+        self.chunks = 0  # Non empty response body messages
+        self.bytes_received = 0  # Response body, as sent by the app
+        self.bytes_decoded = 0  # Response body, once content-encoding is decoded
+        self.decode_time = 0.0  # Seconds spent decoding content-encoding
+        self.bytes_sent = 0  # Request body
+
+    def __repr__(self):
+        return f"<Timings {self.as_dict()}>"
+
+    def _since_call(self, timestamp: Optional[float]) -> Optional[float]:
+        return None if timestamp is None else timestamp - self.app_call
+
+    @property
+    def time_to_start(self) -> Optional[float]:
+        """ Seconds from app call to "http.response.start". """
+        return self._since_call(self.response_start)
+
+    @property
+    def time_to_first_byte(self) -> Optional[float]:
+        """ Seconds from app call to the first response body chunk. """
+        return self._since_call(self.first_body)
+
+    @property
+    def total(self) -> Optional[float]:
+        """ Seconds from app call to the last response body chunk. """
+        return self._since_call(self.last_body)
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        """ Decoded over received body size, None for an empty body. """
+        if not self.bytes_received:
+            return None
+        return self.bytes_decoded / self.bytes_received
+
+    def as_dict(self) -> dict:
+        return {
+            "time_to_start": self.time_to_start,
+            "time_to_first_byte": self.time_to_first_byte,
+            "total": self.total,
+            "chunks": self.chunks,
+            "bytes_received": self.bytes_received,
+            "bytes_decoded": self.bytes_decoded,
+            "compression_ratio": self.compression_ratio,
+            "decode_time": self.decode_time,
+            "bytes_sent": self.bytes_sent,
+        }
+
+
 class Response:
-    """
-        TODO: Allow Response object to act as stream
-    """
+    """ HTTP response of the ASGI app.
+        Streamed responses (`send(..., stream=True)`) are returned as soon as
+        the app starts the response, their body is consumed with `aiter_bytes`,
+        `aiter_lines` or `aread` while the app keeps running. """
 
-    def __init__(self, url: str, status_code: int, headers: ResHeaders) -> None:
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: ResHeaders,
+        codec: Optional[JSONCodec] = None,
+    ) -> None:
         self.url = url
         self.status_code = status_code
         self.reason = HTTPStatus(status_code).phrase
-        self.headers: _Headers = _Headers(headers)
+        self.headers = HeaderMap(headers)
+        self.codec = JSONCodec() if codec is None else codec
         self._content: bytes = b""
+        self._chunks: List[bytes] = []  # Buffered body, joined on first access
+        self.timings: Optional[Timings] = None
+        self.history: List[Response] = []  # Redirects followed to this one
+        # Streamed responses only
+        self._stream: Optional[Queue] = None  # Body chunks, None when done
+        self._task: Optional[Future] = None  # App task
+        self._ended = False  # App sent, or failed before, the last chunk
+        self._consumed = False
+        self._closed = False
 
     def __repr__(self):
         return f"<Response [{self.status_code}]>"
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    @property
+    def elapsed(self) -> timedelta:
+        """ Time from app call to the last body chunk, zero if unknown. """
+        total = self.timings.total if self.timings is not None else None
+        return timedelta(seconds=total or 0)
+
+    @property
+    def total_elapsed(self) -> timedelta:
+        """ Elapsed of every hop of the redirect chain, this one included. """
+        return sum((r.elapsed for r in self.history), self.elapsed)
+
+    @property
+    def is_redirect(self) -> bool:
+        return self.status_code in REDIRECT_CODES and "location" in self.headers
+
     def raise_for_status(self) -> None:
         """ Raises `HTTPError`, if one occurred. """
         if 400 <= self.status_code < 500:
@@ -98,15 +271,70 @@ class Response:
     @property
     def content(self) -> bytes:
         """ Content of the response, in bytes. """
+        if self._chunks:
+            self._chunks.insert(0, self._content)
+            self._content = b"".join(self._chunks)
+            self._chunks = []
         return self._content
 
     @content.setter
     def content(self, content: bytes):
-        """ Allow streaming response by appending content. """
-        if self._content:
-            self._content += content
-        else:
-            self._content = content
+        """ Allow streaming response by appending content.
+            Chunks are only buffered here, so building a body out of many
+            small chunks takes linear time. """
+        if content:
+            self._chunks.append(content)
+
+    @property
+    def view(self) -> memoryview:
+        """ Zero-copy, read-only view of the content. """
+        return memoryview(self.content)
+
+    async def aiter_bytes(self) -> AsyncIterator[bytes]:
+        """ Iterate over body chunks as the app sends them. """
+        if self._stream is None:
+            if self.content:
+                yield self.content
+            return
+        if self._consumed or self._closed:
+            raise RuntimeError("Response stream has already been consumed.")
+
+        self._consumed = True
+        stream = self._stream
+        while not (self._ended and stream.empty()):
+            chunk = await stream.get()
+            if chunk is None:
+                break
+            yield chunk
+        await cast(Future, self._task)  # Raise app exceptions, if any
+
+    async def aiter_lines(self) -> AsyncIterator[str]:
+        """ Iterate over body lines, without line endings, as they arrive. """
+        pending = b""
+        async for chunk in self.aiter_bytes():
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line.rstrip(b"\r").decode()
+        if pending:
+            yield pending.decode()
+
+    async def aread(self) -> bytes:
+        """ Read the rest of a streamed body, return the whole content. """
+        if self._stream is not None and not self._consumed:
+            async for chunk in self.aiter_bytes():
+                self.content = chunk
+        return self.content
+
+    async def aclose(self) -> None:
+        """ Stop the app of a streamed response if still running. """
+        self._closed = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except CancelledError:
+                pass
 
     @property
     def text(self):
@@ -116,25 +344,237 @@ class Response:
     def json(self, **kwargs):
         """ Returns the json-encoded content of a response, if any.
 
-            :param **kwargs: Optional arguments that ``json.loads`` takes.
+            Decoded straight from bytes by the client JSON codec.
+
+            :param **kwargs: Optional arguments that ``json.loads`` takes, the
+                stdlib json is used when given.
             :raises ValueError: If the response body does not contain valid json. """
         try:
-            json = _json.loads(self.text, **kwargs)
-            return json
-        except _json.JSONDecodeError:
+            if kwargs:
+                return _json.loads(self.content, **kwargs)
+            return self.codec.loads(self.content)
+        except ValueError:
             raise ValueError(
                 f"Response content is not JSON serializable. Text {self.text}"
             )
 
 
+class Exchange:
+    """ State of a single HTTP request/response cycle.
+        Each request gets its own exchange, so many requests can be in flight
+        on the same client at once without sharing any state. """
+
+    stream_buffer = 16  # Max body chunks buffered ahead of a streamed response
+
+    def __init__(
+        self,
+        url: str,
+        body: Body,
+        stream: bool = False,
+        codec: Optional[JSONCodec] = None,
+        decode_content: bool = False,
+    ) -> None:
+        self.url = url
+        self.body = body
+        self.stream = stream
+        self.codec = codec  # Of the response
+        self.decode_content = decode_content  # Response content-encoding
+        self.decoder: Optional[Decoder] = None
+        self.request_complete = False
+        self.response: Optional[Response] = None
+        self.response_started = False
+        self.response_complete = False
+        loop = get_event_loop()
+        self.started: Future = loop.create_future()
+        self.finished: Future = loop.create_future()
+        self.queue: Optional[Queue] = None  # Body chunks of streamed responses
+        self.timings = Timings()
+
+    async def send(self, message: Message) -> None:
+        """ Mimic ASGI send awaitable, create and set response object. """
+        if message["type"] == "http.response.start":
+            assert (
+                not self.response_started
+            ), 'Received multiple "http.response.start" messages.'
+            self.response = Response(
+                self.url,
+                status_code=message["status"],
+                headers=message["headers"],
+                codec=self.codec,
+            )
+            self.timings.response_start = perf_counter()
+            self.response.timings = self.timings
+            if self.decode_content:
+                encoding = self.response.headers.get("content-encoding")
+                self.decoder = get_decoder(encoding)
+            if self.stream:
+                self.queue = Queue(maxsize=self.stream_buffer)
+                self.response._stream = self.queue
+            self.response_started = True
+            self.started.set_result(True)
+        elif message["type"] == "http.response.body":
+            assert (
+                self.response_started
+            ), 'Received "http.response.body" without "http.response.start".'
+            assert (
+                not self.response_complete
+            ), 'Received "http.response.body" after response completed.'
+            response = cast(Response, self.response)
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            timings = self.timings
+            if body:
+                if not timings.chunks:
+                    timings.first_body = perf_counter()
+                timings.chunks += 1
+                timings.bytes_received += len(body)
+            if not more_body:
+                timings.last_body = perf_counter()
+            if self.decoder is not None:
+                started = perf_counter()
+                try:
+                    body = self.decoder.decode(body) if body else b""
+                    if not more_body:
+                        body += self.decoder.flush()
+                except Exception as ex:
+                    encoding = response.headers.get("content-encoding")
+                    raise DecodingError(
+                        f"Can't decode the {encoding} response body of {self.url}"
+                    ) from ex
+                timings.decode_time += perf_counter() - started
+            timings.bytes_decoded += len(body)
+            if not self.stream:
+                response.content = body
+            elif body and not response._closed:
+                await self.queue.put(body)  # type: ignore
+            if not more_body:
+                self.response_complete = True
+                self.finished.set_result(True)
+                if self.stream:
+                    response._ended = True
+                    if not response._closed:
+                        await self.queue.put(None)  # type: ignore
+
+    @property
+    def pending(self) -> str:
+        """ What the exchange is waiting on, for timeout errors. """
+        if not self.response_started:
+            return '"http.response.start"'
+        if not self.response_complete:
+            return '"http.response.body"'
+        if not self.request_complete:
+            return "the app to read the request body"
+        return "the app to return"
+
+    async def finish(self) -> None:
+        """ Called once the app returns, ends the body of streamed responses.
+            Never blocks: a consumer draining a full queue sees `_ended`. """
+        if not self.finished.done():
+            self.finished.set_result(True)
+        if self.stream and self.response_started and not self.response_complete:
+            self.response_complete = True
+            response = cast(Response, self.response)
+            response._ended = True
+            try:
+                self.queue.put_nowait(None)  # type: ignore
+            except QueueFull:
+                pass
+
+    async def receive(self) -> Message:
+        """ Mimic ASGI receive awaitable.
+            Streamed bodies are sent one chunk per message, once the whole body
+            is sent, waits for the response to complete and disconnects. """
+        if self.request_complete:
+            await self.finished
+            return {"type": "http.disconnect"}
+        if self.timings.first_receive is None:
+            self.timings.first_receive = perf_counter()
+
+        if isinstance(self.body, bytes):
+            self.request_complete = True
+            self.timings.bytes_sent = len(self.body)
+            return {"type": "http.request", "body": self.body, "more_body": False}
+
+        try:
+            chunk = await self.body.__anext__()
+        except StopAsyncIteration:
+            self.request_complete = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        self.timings.bytes_sent += len(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": True}
+
+
+class WsQueue(Queue):
+    """ Websocket messages queue, `overflow` sets what a put does when full:
+        - block: wait for room, backpressure as a real socket would apply.
+        - drop_oldest: discard the oldest message in the queue.
+        - error: raise `asyncio.QueueFull`.
+        Tracks the highest number of queued messages in `high_water`. """
+
+    policies = ("block", "drop_oldest", "error")
+
+    def __init__(self, maxsize: int = 0, overflow: str = "block") -> None:
+        if overflow not in self.policies:
+            raise ValueError(f"Overflow must be one of {', '.join(self.policies)}")
+        super().__init__(maxsize)
+        self.overflow = overflow
+        self.high_water = 0
+        self.dropped = 0
+
+    async def put(self, item: Message) -> None:
+        if self.full():
+            if self.overflow == "drop_oldest":
+                self.get_nowait()
+                self.dropped += 1
+            elif self.overflow == "error":
+                raise QueueFull(f"Websocket queue full ({self.maxsize} messages)")
+        await super().put(item)
+        if self.qsize() > self.high_water:
+            self.high_water = self.qsize()
+
+
 class WsSession:
-    def __init__(self, app: ASGI3App, scope: Scope) -> None:
-        self._client: Queue = Queue()  # For ASGI app to send messages
-        self._server: Queue = Queue()  # For client session to send message to ASGI app
+    def __init__(
+        self,
+        app: ASGI3App,
+        scope: Scope,
+        raise_server_exceptions: bool = True,
+        max_queue: int = 0,
+        overflow: str = "block",
+        timeout: Optional[float] = None,
+        slow_calls: Optional[SlowCalls] = None,
+        hooks: Optional[Hooks] = None,
+        codec: Union[None, str, JSONCodec] = None,
+    ) -> None:
+        # For ASGI app to send messages
+        self._client: WsQueue = WsQueue(max_queue, overflow)
+        # For client session to send message to ASGI app
+        self._server: WsQueue = WsQueue(max_queue, overflow)
+        self.raise_server_exceptions = raise_server_exceptions
+        self.closed = False
+        self.path = scope["path"]
+        self.timeout = timeout  # Default for receive and close calls
+        self.slow_calls = SlowCalls() if slow_calls is None else slow_calls
+        self.codec = get_codec(codec)  # For send_json and receive_json
+
+        receive, send = self._server_receive, self._server_send
+        if hooks is None:
+            app_call = app(scope, receive, send)
+        else:
+            app_call = app(scope, *wrap_channels(scope, receive, send, hooks))
+            if hooks["exception"]:
+                app_call = catch_exceptions(app_call, scope, hooks)
+        self._server_task = ensure_future(app_call)
 
-        self._server_task = ensure_future(
-            app(scope, self._server_receive, self._server_send)
-        )
+    @property
+    def queue_stats(self) -> dict:
+        """ High-water marks and dropped messages of both directions. """
+        return {
+            "client_high_water": self._client.high_water,
+            "server_high_water": self._server.high_water,
+            "client_dropped": self._client.dropped,
+            "server_dropped": self._server.dropped,
+        }
 
     async def _start(self) -> None:
         """ Start conmunication between client and ASGI app. """
@@ -150,16 +590,80 @@ class WsSession:
         return await self._server.get()
 
     async def send(self, message: Message) -> None:
-        """ Put message on ASGI app queue where it can consume it. """
-        await self._server.put(message)
-
-    async def receive(self) -> Message:
-        """ Read message from ASGI app. """
-        message = await self._client.get()
+        """ Put message on ASGI app queue where it can consume it. A bounded
+            queue blocking for longer than `timeout` raises `Timeout`. """
+        if not self._server.maxsize or self.timeout is None:
+            await self._server.put(message)
+            return
+        started = perf_counter()
+        try:
+            await wait_for(self._server.put(message), self.timeout)
+        except TimeoutError:
+            raise Timeout(
+                f"Websocket {self.path} send",
+                perf_counter() - started,
+                "room in the app's queue",
+            ) from None
+
+    async def receive(self, timeout: Optional[float] = None) -> Message:
+        """ Read message from ASGI app, raise `Timeout` after `timeout` seconds. """
+        timeout = self.timeout if timeout is None else timeout
+        started = perf_counter()
+        try:
+            message = await wait_for(self._client.get(), timeout)
+        except TimeoutError:
+            raise Timeout(
+                f"Websocket {self.path} receive",
+                perf_counter() - started,
+                "a message from the app",
+            ) from None
+        finally:
+            self.slow_calls.check(f"Websocket {self.path} receive", started)
         if message["type"] == "websocket.close":
             raise WsDisconnect
         return message
 
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Message:
+        """ Iterate over messages from the ASGI app until it closes. """
+        try:
+            return await self.receive()
+        except WsDisconnect:
+            raise StopAsyncIteration
+
+    async def send_many(self, messages: Iterable[Union[str, bytes, Message]]) -> None:
+        """ Send many messages, `str` as text, `bytes` as binary frames and
+            dicts as raw ASGI messages. """
+        for message in messages:
+            if isinstance(message, str):
+                message = {"type": "websocket.receive", "text": message}
+            elif isinstance(message, bytes):
+                message = {"type": "websocket.receive", "bytes": message}
+            await self.send(message)
+
+    async def receive_many(
+        self, count: int, timeout: Optional[float] = None
+    ) -> List[Message]:
+        """ Read `count` messages, `timeout` is a deadline for all of them. """
+        messages: List[Message] = []
+
+        async def receive() -> List[Message]:
+            while len(messages) < count:
+                messages.append(await self.receive())
+            return messages
+
+        started = perf_counter()
+        try:
+            return await wait_for(receive(), timeout)
+        except TimeoutError:
+            raise Timeout(
+                f"Websocket {self.path} receive_many",
+                perf_counter() - started,
+                f"{count - len(messages)} of {count} messages",
+            ) from None
+
     async def send_text(self, message: str) -> None:
         await self.send({"type": "websocket.receive", "text": message})
 
@@ -174,19 +678,110 @@ class WsSession:
         message = await self.receive()
         return message.get("bytes")
 
-    async def send_json(self, message: str) -> None:
-        message = _json.dumps(message)
-        await self.send_text(message)
+    async def send_json(self, message: Any) -> None:
+        text = self.codec.dumps(message).decode()
+        await self.send({"type": "websocket.receive", "text": text})
 
     async def receive_json(self):
-        message = (await self.receive()).get("text")
-        return _json.loads(message)
+        message = await self.receive()
+        data = message.get("text")
+        return self.codec.loads(data if data is not None else message.get("bytes"))
+
+    async def close(self, code: int = 1000, timeout: Optional[float] = None):
+        """ Finish session with server, wait until handler is done.
+            Handler exceptions are raised here, a handler still running after
+            `timeout` seconds is cancelled and `Timeout` raised. """
+        timeout = self.timeout if timeout is None else timeout
+        started = perf_counter()
+        task = self._server_task
+        try:
+            if not self.closed and not task.done():  # Nobody to read it otherwise
+                disconnect = {"type": "websocket.disconnect", "code": code}
+                put = ensure_future(self._server.put(disconnect))
+                try:
+                    # A full queue may never drain if the handler stopped reading
+                    await wait(
+                        [put, task], timeout=timeout, return_when=FIRST_COMPLETED
+                    )
+                finally:
+                    put.cancel()
+                if put.done() and not put.cancelled():
+                    put.exception()  # Full with the error policy, handler decides
+            self.closed = True
+            if timeout is not None:
+                timeout = max(timeout - (perf_counter() - started), 0)
+            # Unlike wait_for, a CancelledError here is always the caller's
+            await wait([task], timeout=timeout)
+        except CancelledError:
+            task.cancel()
+            raise
+        if not task.done():
+            task.cancel()
+            await wait([task])
+            raise Timeout(
+                f"Websocket {self.path} close",
+                perf_counter() - started,
+                "the handler to return",
+            )
+        if task.cancelled():  # By someone else
+            return
+        exception = task.exception()
+        if exception is not None and self.raise_server_exceptions:
+            raise exception
+
+
+class Lifespan:
+    """ Runs the ASGI lifespan protocol of an app in a background task, kept
+        alive between startup and shutdown. Apps not supporting lifespan (which
+        raise or return on startup) are ignored, as ASGI servers do. """
+
+    def __init__(self, app: ASGI3App) -> None:
+        self.app = app
+        self.state: dict = {}
+        self.supported = True
+        self._server: Queue = Queue()  # Messages for the app
+        self._client: Queue = Queue()  # Messages from the app, None once done
+        self._task: Optional[Future] = None
+        self._error: Optional[Exception] = None
+
+    async def _run(self, scope: Scope) -> None:
+        try:
+            await self.app(scope, self._server.get, self._client.put)
+        except Exception as ex:
+            self._error = ex
+        finally:
+            await self._client.put(None)
+
+    async def _call(self, event: str) -> None:
+        """ Send a lifespan event and wait on the app to complete it. """
+        await self._server.put({"type": f"lifespan.{event}"})
+        message = await self._client.get()
+        if message is None:
+            if event == "startup":  # App doesn't support lifespan
+                self.supported = False
+                return
+            raise self._error or RuntimeError(f"Lifespan ended before {event}.")
+        if message["type"] == f"lifespan.{event}.failed":
+            raise RuntimeError(
+                f"Lifespan {event} failed: {message.get('message', '')}"
+            )
+
+    async def startup(self) -> None:
+        scope = {
+            "type": "lifespan",
+            "asgi": {"version": "3.0", "spec_version": "2.0"},
+            "state": self.state,
+        }
+        self._task = ensure_future(self._run(scope))
+        await self._call("startup")
 
-    async def close(self):
-        """ Finish session with server, wait until handler is done. """
-        await self.send({"type": "websocket.disconnect", "code": 1000})
-        while not self._server_task.done():
-            await sleep(0.1)
+    async def shutdown(self) -> None:
+        if not self.supported:
+            return
+        await self._call("shutdown")
+        await cast(Future, self._task)
+        if self._error is not None:
+            raise self._error
 
 
 class WsContextManager:
@@ -201,16 +796,74 @@ class WsContextManager:
         await self.ws_session.close()
 
 
+class PreparedRequest:
+    """ Request whose url and headers were parsed and encoded once, by
+        `TestClient.prepare`. Each `send` copies the scope template, only the
+        body and extra query `params` are processed per call. Redirects are
+        not followed.
+
+        ping = client.prepare("GET", "/ping", headers={"x-token": "abc"})
+        for _ in range(1000):
+            response = await ping.send()
+    """
+
+    def __init__(self, client: "TestClient", url: str, scope: Scope) -> None:
+        self.client = client
+        self.url = url
+        self.scope = scope  # Template, never handed to the app
+
+    def __repr__(self):
+        return f"<PreparedRequest {self.scope['method']} {self.url}>"
+
+    def clone(self, headers: Headers = {}) -> "PreparedRequest":
+        """ Copy of this request, with extra `headers` encoded once as well. """
+        scope = dict(self.scope)
+        scope["headers"] = self.scope["headers"] + encode_headers(headers)
+        return self.__class__(self.client, self.url, scope)
+
+    def build_scope(self, params: Params = {}) -> Scope:
+        """ Fresh scope for one call, `params` appended to the query string. """
+        scope = dict(self.scope)
+        scope["headers"] = list(self.scope["headers"])  # Body headers are added
+        if params:
+            query = urlencode(params).encode()
+            if scope["query_string"]:
+                query = scope["query_string"] + b"&" + query
+            scope["query_string"] = query
+        return scope
+
+    async def send(
+        self,
+        params: Params = {},
+        data: dict = {},
+        json: dict = {},
+        content: Optional[Content] = None,
+        files: Optional[dict] = None,
+        stream: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        return await self.client._request(
+            self.build_scope(params),
+            self.url,
+            data=data,
+            json=json,
+            content=content,
+            files=files,
+            stream=stream,
+            timeout=timeout,
+        )
+
+
 class TestClient:
     """
         Client for testing ASGI applications.
         Mimics ASGI server parsing requests and responses, replicating requests API.
         TODO:
-            - Support Websockets client.
-            - Cookies support.
-            - Redirects. """
+            - Support Websockets client. """
 
     __test__ = False  # For pytest
+    ws_class = WsSession
+    prepared_class = PreparedRequest
     default_headers: list = [
         (b"user-agent", b"testclient"),
         (b"accept-encoding", b"gzip, deflate"),
@@ -223,6 +876,17 @@ class TestClient:
         app: Union[ASGI2App, ASGI3App],
         raise_server_exceptions: bool = True,
         base_url: str = "http://testserver",
+        chunk_size: int = 65536,
+        ws_max_queue: int = 0,
+        ws_overflow: str = "block",
+        timeout: Optional[float] = None,
+        slow_threshold: Optional[float] = None,
+        hooks: Optional[Dict[str, Union[Callable, List[Callable]]]] = None,
+        json_codec: Union[None, str, JSONCodec] = None,
+        decode_content: bool = True,
+        cookies: Union[None, Dict[str, str], CookieJar] = None,
+        follow_redirects: bool = False,
+        max_redirects: int = 20,
     ) -> None:
 
         if is_asgi2(app):
@@ -233,6 +897,38 @@ class TestClient:
             self.app = cast(ASGI3App, app)
         self.base_url = base_url
         self.raise_server_exceptions = raise_server_exceptions
+        self.chunk_size = chunk_size  # Bytes per message of streamed bodies
+        self.ws_max_queue = ws_max_queue  # Messages per direction, 0 is unbounded
+        self.ws_overflow = ws_overflow  # See `WsQueue`
+        self.timeout = timeout  # Seconds, default of every call
+        self.slow_calls = SlowCalls(slow_threshold)
+        self.json_codec = get_codec(json_codec)  # See `codec.get_codec`
+        self.decode_content = decode_content  # False keeps compressed bodies
+        self.cookies = CookieJar(cookies)  # Pre-seeded by a dict or a snapshot
+        self.follow_redirects = follow_redirects  # Default of every call
+        self.max_redirects = max_redirects
+        self.lifespan: Optional[Lifespan] = None
+        self.ws_sessions: WeakSet = WeakSet()  # Opened by this client
+        self.hooks = default_hooks()
+        for event, hook in (hooks or {}).items():
+            for _hook in hook if isinstance(hook, list) else [hook]:
+                self.register_hook(event, _hook)
+
+    def register_hook(self, event: str, hook: Callable) -> None:
+        """ Add a hook for `event`, one of `hooks.HOOKS`. """
+        if event not in HOOKS:
+            raise ValueError(f"Unsupported event {event}, must be one of {HOOKS}")
+        self.hooks[event].append(hook)
+
+    async def __aenter__(self):
+        """ Run lifespan startup, reused by every request until exit. """
+        self.lifespan = Lifespan(self.app)
+        await self.lifespan.startup()
+        return self
+
+    async def __aexit__(self, *args):
+        lifespan, self.lifespan = self.lifespan, None
+        await cast(Lifespan, lifespan).shutdown()
 
     async def send(
         self,
@@ -242,45 +938,248 @@ class TestClient:
         data: dict = {},
         headers: Headers = {},
         json: dict = {},
+        content: Optional[Content] = None,
+        files: Optional[dict] = None,
         subprotocols: Optional[List[str]] = None,
         ws: bool = False,
+        stream: bool = False,
+        timeout: Optional[float] = None,
+        follow_redirects: Optional[bool] = None,
     ) -> Union[Response, WsSession]:
         """ Handle request/response cycle seting up request, creating scope dict,
             calling the app and awaiting in the handler to return the response. """
-        self.url = url
+        if follow_redirects is None:
+            follow_redirects = self.follow_redirects
+        if follow_redirects and not ws:
+            return await self._follow_redirects(
+                method,
+                url,
+                params=params,
+                headers=headers,
+                body=dict(data=data, json=json, content=content, files=files),
+                stream=stream,
+                timeout=timeout,
+            )
         scheme, host, port, path, query = self.prepare_url(url, params=params)
         req_headers: ReqHeaders = self.prepare_headers(host, headers)
-
-        scope = {
-            "http_version": "1.1",
-            "method": method,
-            "path": path,
-            "root_path": "",
-            "scheme": scheme,
-            "query_string": query,
-            "headers": req_headers,
-            "client": ("testclient", 5000),
-            "server": [host, port],
-        }
+        scope = self.prepare_scope(method, scheme, host, port, path, query, req_headers)
 
         if ws:
+            if self.lifespan is not None and self.lifespan.supported:
+                scope["state"] = dict(self.lifespan.state)
             scope["type"] = "websocket"
             scope["scheme"] = "ws"
             scope["subprotocols"] = subprotocols or []
-            session = WsSession(self.app, scope)
+            self.prepare_cookies(scope)
+            dispatch_hook("request", self.hooks, scope)
+            session = self.ws_class(
+                self.app,
+                scope,
+                self.raise_server_exceptions,
+                max_queue=self.ws_max_queue,
+                overflow=self.ws_overflow,
+                timeout=self.timeout,
+                slow_calls=self.slow_calls,
+                hooks=self.hooks,
+                codec=self.json_codec,
+            )
             await session._start()
+            self.ws_sessions.add(session)
             return session
 
+        return await self._request(
+            scope,
+            url,
+            data=data,
+            json=json,
+            content=content,
+            files=files,
+            stream=stream,
+            timeout=timeout,
+        )
+
+    async def _follow_redirects(
+        self,
+        method: str,
+        url: str,
+        params: Params,
+        headers: Headers,
+        body: Dict[str, Any],
+        stream: bool,
+        timeout: Optional[float],
+    ) -> Response:
+        """ Send the request then every request it's redirected to, up to
+            `max_redirects`. The final response has the others in `history`.
+            As browsers do, 303s and POSTs redirected by 301/302 become GETs
+            without a body, other methods keep theirs only on 307/308. """
+        if url.startswith("/"):
+            url = f"{self.base_url}{url}"
+        history: List[Response] = []
+        seen = set()
+        while True:
+            # Loops are the same request made with the same cookies
+            state = frozenset((c.key, c.value) for c in self.cookies)
+            if (method, url, state) in seen:
+                raise RedirectLoop(f"Redirect loop at {method} {url}", history)
+            seen.add((method, url, state))
+
+            response = cast(
+                Response,
+                await self.send(
+                    method,
+                    url,
+                    params=params,
+                    headers=headers,
+                    stream=stream,
+                    timeout=timeout,
+                    follow_redirects=False,
+                    **body,
+                ),
+            )
+            if response is None or not response.is_redirect:
+                break
+            if len(history) == self.max_redirects:
+                history.append(response)
+                raise TooManyRedirects(
+                    f"Exceeded {self.max_redirects} redirects", history
+                )
+            if stream:
+                await response.aread()
+            history.append(response)
+
+            location = urljoin(url, cast(str, response.headers["location"]))
+            if urlsplit(location).netloc != urlsplit(url).netloc:
+                headers = [  # Credentials stay on their host
+                    (name, value)
+                    for name, value in HeaderMap(encode_headers(headers)).items()
+                    if name.lower() != "authorization"
+                ]
+            url, params = location, {}
+            status_code = response.status_code
+            if (status_code == 303 and method != "HEAD") or (
+                status_code in (301, 302) and method == "POST"
+            ):
+                method = "GET"
+            if status_code not in (307, 308):
+                body = {}
+            elif body.get("files") or not isinstance(
+                body.get("content"), (type(None), str, bytes)
+            ):
+                raise HTTPError(
+                    f"Can't follow a {status_code} redirect to {url}, "
+                    "the streamed request body can't be sent again"
+                )
+        if response is not None:
+            response.history = history
+        return response
+
+    async def _request(
+        self,
+        scope: Scope,
+        url: str,
+        data: dict = {},
+        json: dict = {},
+        content: Optional[Content] = None,
+        files: Optional[dict] = None,
+        stream: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        """ Run the HTTP request/response cycle of a prepared `scope`. """
+        if self.lifespan is not None and self.lifespan.supported:
+            scope["state"] = dict(self.lifespan.state)
         scope["type"] = "http"
-        self.prepare_body(req_headers, data=data, json=json)
+        self.prepare_cookies(scope)
+        dispatch_hook("request", self.hooks, scope)
+        body = self.prepare_body(
+            scope["headers"], data=data, json=json, content=content, files=files
+        )
+        exchange = Exchange(
+            url,
+            body,
+            stream=stream,
+            codec=self.json_codec,
+            decode_content=self.decode_content,
+        )
+        timeout = self.timeout if timeout is None else timeout
+        call = f"{scope['method']} {url}"
+        started = perf_counter()
+        if not stream:
+            try:
+                await wait_for(self._run_app(scope, exchange), timeout)
+            except TimeoutError:
+                elapsed = perf_counter() - started
+                if timeout is None or elapsed < timeout:
+                    raise  # Raised by the app itself
+                raise Timeout(call, elapsed, exchange.pending) from None
+            finally:
+                self.slow_calls.check(call, started)
+            if exchange.response is None:  # App failed, not raising exceptions
+                return cast(Response, None)
+            self.extract_cookies(scope, exchange.response)
+            return dispatch_hook("response", self.hooks, exchange.response)
+
+        task = ensure_future(self._run_app(scope, exchange))
+        await wait(
+            [task, exchange.started], timeout=timeout, return_when=FIRST_COMPLETED
+        )
+        self.slow_calls.check(call, started)
+        if not task.done() and not exchange.started.done():
+            task.cancel()
+            raise Timeout(call, perf_counter() - started, exchange.pending)
+        if not exchange.started.done():
+            task.result()  # App failed before starting the response
+            return cast(Response, exchange.response)
+        # Body errors are raised once iteration reaches them
+        response = cast(Response, exchange.response)
+        response._task = task
+        self.extract_cookies(scope, response)
+        return dispatch_hook("response", self.hooks, response)
+
+    async def _run_app(self, scope: Scope, exchange: Exchange) -> None:
+        receive, send = wrap_channels(
+            scope, exchange.receive, exchange.send, self.hooks
+        )
         try:
-            self.__response_started = False
-            self.__response_complete = False
-            await self.app(scope, self._receive, self._send)
+            await self.app(scope, receive, send)
         except Exception as ex:
+            dispatch_hook("exception", self.hooks, scope, ex)
             if self.raise_server_exceptions:
                 raise ex from None
-        return self._response
+        finally:
+            await exchange.finish()
+
+    def prepare(
+        self, method: str, url: str, params: Params = {}, headers: Headers = {}
+    ) -> "PreparedRequest":
+        """ Parse `url` and encode `headers` once, for a request sent many times.
+            See `PreparedRequest`. """
+        scheme, host, port, path, query = self.prepare_url(url, params=params)
+        req_headers = self.prepare_headers(host, headers)
+        scope = self.prepare_scope(method, scheme, host, port, path, query, req_headers)
+        return self.prepared_class(self, url, scope)
+
+    def prepare_scope(
+        self,
+        method: str,
+        scheme: str,
+        host: str,
+        port: int,
+        path: str,
+        query: bytes,
+        headers: ReqHeaders,
+    ) -> Scope:
+        """ Connection scope, without its type, of a parsed request. """
+        return {
+            "http_version": "1.1",
+            "method": method,
+            "path": path,
+            "root_path": "",
+            "scheme": scheme,
+            "query_string": query,
+            "headers": headers,
+            "client": ("testclient", 5000),
+            "server": [host, port],
+        }
 
     def prepare_url(self, url: str, params: Params) -> Url:
         """ Parse url and query params, run validation.
@@ -330,63 +1229,64 @@ class TestClient:
         _headers += self.default_headers
 
         if headers:
-            if isinstance(headers, dict):
-                _headers += [
-                    (k.encode(), v.encode()) for k, v in headers.items()
-                ]
-            elif isinstance(headers, list):
-                _headers += [(k.encode(), v.encode()) for k, v in headers]
-            else:
-                raise ValueError("Headers must be Dict or List objects")
+            _headers += encode_headers(headers)
         return _headers
 
+    def prepare_cookies(self, scope: Scope) -> None:
+        """ Add the `cookie` header of the jar cookies matching the request,
+            unless the request has one already. """
+        if not self.cookies:
+            return
+        headers = scope["headers"]
+        if any(name.lower() == b"cookie" for name, _ in headers):
+            return
+        cookie = self.cookies.header(scope["server"][0], scope["path"], scope["scheme"])
+        if cookie is not None:
+            headers.append((b"cookie", cookie))
+
+    def extract_cookies(self, scope: Scope, response: Response) -> None:
+        """ Store the `set-cookie` cookies of a response in the jar. """
+        set_cookies = response.headers.get_list("set-cookie")
+        if set_cookies:
+            self.cookies.extract(scope["server"][0], scope["path"], set_cookies)
+
     def prepare_body(
-        self, headers: ReqHeaders, data: dict = {}, json: dict = {}
-    ) -> None:
+        self,
+        headers: ReqHeaders,
+        data: dict = {},
+        json: dict = {},
+        content: Optional[Content] = None,
+        files: Optional[dict] = None,
+    ) -> Body:
         """ Prepares the given HTTP body data.
-            TODO: Support files encoding
+            Raw `content` may be str, bytes, or a file object, sync or async
+            iterable streamed to the app in `chunk_size` messages.
+            `files` (along with `data` fields) are streamed as multipart/form-data.
         """
-        self._body: bytes = b""
-        if not data and json:
+        body: bytes = b""
+        if files:
+            multipart = Multipart(data, files, self.chunk_size)
+            headers.append((b"content-type", multipart.content_type))
+            headers.append((b"transfer-encoding", b"chunked"))
+            return multipart.__aiter__()
+        elif content is not None:
+            if isinstance(content, str):
+                body = content.encode()
+            elif isinstance(content, (bytes, bytearray, memoryview)):
+                body = bytes(content)
+            else:
+                headers.append((b"transfer-encoding", b"chunked"))
+                return iter_content(content, self.chunk_size)
+        elif not data and json:
             headers.append((b"content-type", b"application/json"))
-            self._body = _json.dumps(json).encode()
+            body = self.json_codec.dumps(json)
         elif data:
-            self._body = urlencode(data, doseq=True).encode()
+            body = urlencode(data, doseq=True).encode()
             headers.append(
                 (b"content-type", b"application/x-www-form-urlencoded")
             )
-        headers.append((b"content-length", str(len(self._body)).encode()))
-
-    async def _send(self, message: Message) -> None:
-        """ Mimic ASGI send awaitable, create and set response object. """
-        if message["type"] == "http.response.start":
-            assert (
-                not self.__response_started
-            ), 'Received multiple "http.response.start" messages.'
-            self._response = Response(
-                self.url,
-                status_code=message["status"],
-                headers=[
-                    (k.decode(), v.decode()) for k, v in message["headers"]
-                ],
-            )
-            self.__response_started = True
-        elif message["type"] == "http.response.body":
-            assert (
-                self.__response_started
-            ), 'Received "http.response.body" without "http.response.start".'
-            assert (
-                not self.__response_complete
-            ), 'Received "http.response.body" after response completed.'
-            self._response.content = message.get("body", b"")
-            if not message.get("more_body", False):
-                self.__response_complete = True
-
-    async def _receive(self) -> Message:
-        """ Mimic ASGI receive awaitable.
-            TODO: Mimic Stream requests
-        """
-        return {"type": "http.request", "body": self._body, "more_body": False}
+        headers.append((b"content-length", str(len(body)).encode()))
+        return body
 
     async def get(self, url, **kwargs):
         return await self.send("GET", url, **kwargs)
@@ -414,6 +1314,69 @@ class TestClient:
             "GET", url, subprotocols=subprotocols, ws=True, **kwargs
         )
 
+    async def run_load(
+        self,
+        method: Optional[str] = None,
+        url: Optional[str] = None,
+        requests: Optional[Iterable[dict]] = None,
+        concurrency: int = 10,
+        rate: Optional[float] = None,
+        duration: Optional[float] = None,
+        count: Optional[int] = None,
+        **kwargs,
+    ) -> load.LoadResult:
+        """ Drive the app with many concurrent requests, see `load.run_load`.
+            Either repeats a single request (`method`, `url` and `send` kwargs)
+            or issues `requests`, an iterable of `send` keyword arguments. """
+        if requests is None:
+            if method is None or url is None:
+                raise ValueError("Either method and url or requests are required")
+            if kwargs.get("ws"):
+                raise ValueError("Websocket requests can't be load tested")
+            if duration is None and count is None:
+                raise ValueError("Repeating a request requires duration or count")
+            requests = load.template(method, url, **kwargs)
+        return await load.run_load(
+            self,
+            requests,
+            concurrency=concurrency,
+            rate=rate,
+            duration=duration,
+            count=count,
+        )
+
+    def ws_fanout(
+        self,
+        url: str,
+        sessions: int,
+        connect_rate: Optional[float] = None,
+        **kwargs,
+    ) -> fanout.FanOut:
+        """ Harness driving many websocket sessions at once, see `fanout.FanOut`.
+
+            async with client.ws_fanout("/chat", sessions=1000) as sessions:
+                result = await sessions.publish({...}, expect=1)
+        """
+        return fanout.FanOut(self, url, sessions, connect_rate=connect_rate, **kwargs)
+
+    async def close_all(self, timeout: Optional[float] = None) -> None:
+        """ Close every websocket session still open, all at once.
+            Raises the first handler exception, once all sessions are closed. """
+        results = await gather(
+            *[
+                self._close_session(session, timeout)
+                for session in list(self.ws_sessions)
+                if not session.closed
+            ],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def _close_session(self, session: WsSession, timeout: Optional[float]):
+        return session.close(timeout=timeout)
+
     def ws_session(self, url, subprotocols=None, **kwargs):
         return WsContextManager(
             self.send("GET", url, subprotocols=subprotocols, ws=True, **kwargs)
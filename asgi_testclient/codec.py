@@ -0,0 +1,95 @@
+import importlib
+import json
+
+from asgi_testclient.types import Any, Optional, Union
+
+# Tried in order for the "auto" codec, stdlib json is the fallback
+PREFERRED = ("orjson", "msgspec", "ujson")
+
+
+class JSONCodec:
+    """ Encodes request and websocket JSON, decodes response and websocket JSON.
+        `dumps` returns bytes and `loads` takes bytes or str, so bodies are
+        never decoded to str first. Decode errors are `ValueError`s.
+        This one is the stdlib json, any object with the same two methods can
+        be given to `TestClient(json_codec=...)`. """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        self._orjson = importlib.import_module("orjson")
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        msgspec = importlib.import_module("msgspec")
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+
+class UjsonCodec(JSONCodec):
+    name = "ujson"
+
+    def __init__(self) -> None:
+        self._ujson = importlib.import_module("ujson")
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._ujson.loads(data)
+
+
+CODECS = {
+    "json": JSONCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "ujson": UjsonCodec,
+}
+
+
+def get_codec(codec: Union[None, str, JSONCodec] = None) -> JSONCodec:
+    """ Codec by name, the stdlib one when None, the first installed of
+        `PREFERRED` for "auto". Fast codecs are opt-in as they don't encode
+        exactly alike (spacing, non-str keys...).
+        Naming a codec whose package isn't installed raises ImportError. """
+    if codec is None:
+        return JSONCodec()
+    if codec == "auto":
+        for name in PREFERRED:
+            try:
+                return CODECS[name]()
+            except ImportError:
+                continue
+        return JSONCodec()
+    if isinstance(codec, str):
+        if codec not in CODECS:
+            raise ValueError(
+                f"Unknown JSON codec {codec}, must be auto or one of {tuple(CODECS)}"
+            )
+        return CODECS[codec]()
+    return codec
@@ -0,0 +1,97 @@
+import binascii
+import mimetypes
+import os
+
+from asgi_testclient.types import (
+    Any,
+    AsyncIterator,
+    Content,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+    cast,
+)
+
+
+async def iter_content(content: Content, chunk_size: int) -> AsyncIterator[bytes]:
+    """ Read a request body out of a file, sync or async iterable, in chunks. """
+    if hasattr(content, "read"):
+        while True:
+            chunk = content.read(chunk_size)  # type: ignore
+            if not chunk:
+                break
+            yield chunk.encode() if isinstance(chunk, str) else chunk
+    elif hasattr(content, "__aiter__"):
+        async for chunk in content:  # type: ignore
+            yield chunk.encode() if isinstance(chunk, str) else chunk
+    else:
+        for chunk in cast(Iterable[bytes], content):
+            yield chunk.encode() if isinstance(chunk, str) else chunk
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', "%22")
+
+
+def _file_part(name: str, value: Any) -> Tuple[str, Content, str]:
+    """ Normalize a `files` value into (filename, content, content type).
+        Values are either the content or a (filename, content[, type]) tuple. """
+    content_type: Optional[str] = None
+    if isinstance(value, tuple):
+        if len(value) == 3:
+            filename, content, content_type = value
+        else:
+            filename, content = value
+    else:
+        content = value
+        filename = os.path.basename(getattr(value, "name", "") or "") or name
+    if content_type is None:
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return filename, content, content_type
+
+
+class Multipart:
+    """ Lazy multipart/form-data encoder.
+        Parts are produced chunk by chunk while iterating, file contents are
+        read `chunk_size` bytes at a time, so no part is held in memory. """
+
+    def __init__(
+        self, data: Dict[str, Any], files: Dict[str, Any], chunk_size: int
+    ) -> None:
+        self.data = data or {}
+        self.files = files
+        self.chunk_size = chunk_size
+        self.boundary = binascii.hexlify(os.urandom(16))
+
+    @property
+    def content_type(self) -> bytes:
+        return b"multipart/form-data; boundary=" + self.boundary
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        boundary = b"--" + self.boundary + b"\r\n"
+        for name, values in self.data.items():
+            if not isinstance(values, (list, tuple)):
+                values = [values]
+            for value in values:
+                if not isinstance(value, bytes):
+                    value = str(value).encode()
+                yield boundary + (
+                    f'Content-Disposition: form-data; name="{_quote(name)}"\r\n\r\n'
+                ).encode() + value + b"\r\n"
+
+        for name, value in self.files.items():
+            filename, content, content_type = _file_part(name, value)
+            yield boundary + (
+                f'Content-Disposition: form-data; name="{_quote(name)}"; '
+                f'filename="{_quote(filename)}"\r\n'
+                f"Content-Type: {content_type}\r\n\r\n"
+            ).encode()
+            if isinstance(content, (str, bytes)):
+                yield content.encode() if isinstance(content, str) else content
+            else:
+                async for chunk in iter_content(content, self.chunk_size):
+                    yield chunk
+            yield b"\r\n"
+
+        yield b"--" + self.boundary + b"--\r\n"
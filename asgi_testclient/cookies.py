@@ -0,0 +1,183 @@
+import time
+from http.cookiejar import http2time  # type: ignore
+from http.cookies import CookieError, SimpleCookie
+
+from asgi_testclient.types import Dict, Iterator, List, Optional, Tuple, Union
+
+
+class Cookie:
+    """ A cookie as stored by `CookieJar`, never changed once created.
+        An empty `domain` matches any host (pre-seeded cookies). """
+
+    def __init__(
+        self,
+        name: str,
+        value: str,
+        domain: str = "",
+        path: str = "/",
+        expires: Optional[float] = None,
+        secure: bool = False,
+        host_only: bool = True,
+    ) -> None:
+        self.name = name
+        self.value = value
+        self.domain = domain
+        self.path = path
+        self.expires = expires  # Epoch seconds, None for session cookies
+        self.secure = secure
+        self.host_only = host_only
+
+    def __repr__(self):
+        return f"<Cookie {self.name}={self.value} for {self.domain}{self.path}>"
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return self.domain, self.path, self.name
+
+    def expired(self, now: float) -> bool:
+        return self.expires is not None and self.expires <= now
+
+    def matches(self, host: str, path: str, scheme: str) -> bool:
+        """ Whether the cookie is sent with a request, as of RFC 6265. """
+        if self.secure and scheme not in ("https", "wss"):
+            return False
+        if self.host_only:
+            if host != self.domain:
+                return False
+        elif self.domain and host != self.domain:
+            if not host.endswith(f".{self.domain}"):
+                return False
+        if path == self.path or self.path == "/":
+            return True
+        return path.startswith(self.path) and (
+            self.path.endswith("/") or path[len(self.path)] == "/"
+        )
+
+
+class CookieJar:
+    """ Domain and path aware cookie store of a client. `set-cookie` headers of
+        responses are extracted into it and matching cookies sent back in the
+        `cookie` header of following requests.
+
+        `snapshot` and `restore` save and bring back the whole jar, so a logged
+        in session can be reused without logging in again. """
+
+    def __init__(self, cookies: Union[None, Dict[str, str], "CookieJar"] = None):
+        self._cookies: Dict[Tuple[str, str, str], Cookie] = {}
+        if isinstance(cookies, CookieJar):
+            self.restore(cookies)
+        elif cookies:
+            for name, value in cookies.items():
+                self.set(name, value)
+
+    def __repr__(self):
+        return f"<CookieJar {list(self)}>"
+
+    def __len__(self) -> int:
+        return len(self._cookies)
+
+    def __iter__(self) -> Iterator[Cookie]:
+        return iter(list(self._cookies.values()))
+
+    def __contains__(self, name: object) -> bool:
+        return any(cookie.name == name for cookie in self._cookies.values())
+
+    def set(
+        self,
+        name: str,
+        value: str,
+        domain: str = "",
+        path: str = "/",
+        expires: Optional[float] = None,
+        secure: bool = False,
+    ) -> None:
+        """ Add a cookie, `domain` and its subdomains only if given. """
+        domain = domain.lstrip(".").lower()
+        cookie = Cookie(name, value, domain, path, expires, secure, host_only=False)
+        self._cookies[cookie.key] = cookie
+
+    def get(self, name: str, domain: Optional[str] = None) -> Optional[str]:
+        """ Value of the first cookie named `name`, of `domain` if given. """
+        for cookie in self._cookies.values():
+            if cookie.name == name and domain in (None, cookie.domain):
+                return cookie.value
+        return None
+
+    def delete(self, name: str, domain: Optional[str] = None) -> None:
+        self._cookies = {
+            key: cookie
+            for key, cookie in self._cookies.items()
+            if not (cookie.name == name and domain in (None, cookie.domain))
+        }
+
+    def clear(self) -> None:
+        self._cookies = {}
+
+    def snapshot(self) -> "CookieJar":
+        """ Copy of the jar, cheap as cookies are never changed in place. """
+        jar = CookieJar()
+        jar._cookies = dict(self._cookies)
+        return jar
+
+    def restore(self, snapshot: "CookieJar") -> None:
+        """ Replace every cookie with those of `snapshot`. """
+        self._cookies = dict(snapshot._cookies)
+
+    def extract(self, host: str, path: str, set_cookies: List[str]) -> None:
+        """ Store the cookies of the `set-cookie` header values of a response
+            to a request for `host` and `path`. Invalid ones are ignored. """
+        now = time.time()
+        for header in set_cookies:
+            try:
+                parsed = SimpleCookie(header)
+            except CookieError:
+                continue
+            for name, morsel in parsed.items():
+                domain = morsel["domain"].lstrip(".").lower()
+                if domain and host != domain and not host.endswith(f".{domain}"):
+                    continue  # Set for another site
+                cookie = Cookie(
+                    name,
+                    morsel.value,
+                    domain=domain or host,
+                    path=morsel["path"] or default_path(path),
+                    expires=expiry(morsel["max-age"], morsel["expires"], now),
+                    secure=bool(morsel["secure"]),
+                    host_only=not domain,
+                )
+                self._cookies.pop(("", cookie.path, name), None)  # Pre-seeded
+                if cookie.expired(now):
+                    self._cookies.pop(cookie.key, None)  # Deleted by the app
+                else:
+                    self._cookies[cookie.key] = cookie
+
+    def header(self, host: str, path: str, scheme: str) -> Optional[bytes]:
+        """ `cookie` header value for a request, None if no cookie matches. """
+        now = time.time()
+        cookies = [
+            cookie
+            for cookie in self._cookies.values()
+            if not cookie.expired(now) and cookie.matches(host, path, scheme)
+        ]
+        if not cookies:
+            return None
+        cookies.sort(key=lambda cookie: len(cookie.path), reverse=True)
+        return "; ".join(f"{c.name}={c.value}" for c in cookies).encode("latin-1")
+
+
+def default_path(path: str) -> str:
+    """ Cookie path of a request path, when `set-cookie` doesn't give one. """
+    if not path.startswith("/") or path.count("/") == 1:
+        return "/"
+    return path[: path.rindex("/")]
+
+
+def expiry(max_age: str, expires: str, now: float) -> Optional[float]:
+    if max_age:
+        try:
+            return now + int(max_age)
+        except ValueError:
+            pass
+    if expires:
+        return http2time(expires)
+    return None
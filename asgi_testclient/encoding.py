@@ -0,0 +1,108 @@
+import importlib
+import zlib
+
+from asgi_testclient.types import List, Optional
+
+
+class Decoder:
+    """ Incremental decoder of a response `content-encoding`, fed the body one
+        "http.response.body" message at a time. This one is the identity. """
+
+    def decode(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        """ Whatever is left once the last chunk was decoded. """
+        return b""
+
+
+class GZipDecoder(Decoder):
+    def __init__(self) -> None:
+        self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decode(self, data: bytes) -> bytes:
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class DeflateDecoder(Decoder):
+    """ zlib wrapped deflate, or raw deflate as some servers send it. """
+
+    def __init__(self) -> None:
+        self._obj = zlib.decompressobj()
+        self._first = True
+
+    def decode(self, data: bytes) -> bytes:
+        if self._first and data:
+            self._first = False
+            try:
+                return self._obj.decompress(data)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class BrotliDecoder(Decoder):
+    """ Requires the brotli or brotlicffi package. """
+
+    def __init__(self) -> None:
+        for name in ("brotli", "brotlicffi"):
+            try:
+                brotli = importlib.import_module(name)
+                break
+            except ImportError:
+                continue
+        else:
+            raise ImportError("brotli or brotlicffi is required to decode br responses")
+        self._obj = brotli.Decompressor()
+
+    def decode(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+
+class MultiDecoder(Decoder):
+    """ Several encodings, `decoders` in decoding order. """
+
+    def __init__(self, decoders: List[Decoder]) -> None:
+        self.decoders = decoders
+
+    def decode(self, data: bytes) -> bytes:
+        for decoder in self.decoders:
+            data = decoder.decode(data)
+        return data
+
+    def flush(self) -> bytes:
+        data = b""
+        for decoder in self.decoders:
+            data = (decoder.decode(data) if data else b"") + decoder.flush()
+        return data
+
+
+DECODERS = {
+    "gzip": GZipDecoder,
+    "x-gzip": GZipDecoder,
+    "deflate": DeflateDecoder,
+    "br": BrotliDecoder,
+}
+
+
+def get_decoder(content_encoding: Optional[str]) -> Optional[Decoder]:
+    """ Decoder of a `content-encoding` header value, None when there's nothing
+        to decode or an encoding isn't supported, brotli not being installed
+        included (the body is then left raw). """
+    encodings = [
+        encoding.strip().lower() for encoding in (content_encoding or "").split(",")
+    ]
+    encodings = [e for e in encodings if e and e != "identity"]
+    if not encodings or any(e not in DECODERS for e in encodings):
+        return None
+    try:
+        decoders = [DECODERS[e]() for e in reversed(encodings)]  # Last applied first
+    except ImportError:
+        return None
+    return decoders[0] if len(decoders) == 1 else MultiDecoder(decoders)
@@ -0,0 +1,164 @@
+from asyncio import gather, sleep, wait_for
+from time import perf_counter
+
+from asgi_testclient.load import Histogram
+from asgi_testclient.types import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Message,
+    Optional,
+)
+
+
+class FanOutResult:
+    """ Deliveries of a fan-out round: per message latency and throughput. """
+
+    def __init__(self, sessions: int, elapsed: float, latency: Histogram) -> None:
+        self.sessions = sessions
+        self.elapsed = elapsed
+        self.latency = latency
+
+    def __repr__(self):
+        return (
+            f"<FanOutResult sessions={self.sessions} messages={self.messages} "
+            f"throughput={self.throughput:.1f}/s p99={self.p99:.6f}>"
+        )
+
+    @property
+    def messages(self) -> int:
+        """ Number of messages delivered, across all sessions. """
+        return self.latency.count
+
+    @property
+    def throughput(self) -> float:
+        """ Messages delivered per second. """
+        return self.messages / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def p50(self) -> float:
+        return self.latency.p50
+
+    @property
+    def p90(self) -> float:
+        return self.latency.p90
+
+    @property
+    def p99(self) -> float:
+        return self.latency.p99
+
+    @property
+    def max(self) -> float:
+        return self.latency.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "sessions": self.sessions,
+            "messages": self.messages,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "p50": self.p50,
+            "p90": self.p90,
+            "p99": self.p99,
+            "max": self.max,
+        }
+
+
+class FanOut:
+    """ Opens `sessions` websocket sessions to `url` and drives them at once.
+        Use as an async context manager, all sessions are closed on exit. """
+
+    def __init__(
+        self,
+        client,
+        url: str,
+        sessions: int,
+        connect_rate: Optional[float] = None,
+        **kwargs,
+    ) -> None:
+        self.client = client
+        self.url = url
+        self.size = sessions
+        self.connect_rate = connect_rate  # Sessions opened per second
+        self.kwargs = kwargs
+        self.sessions: List[Any] = []
+        self.connect_latency = Histogram()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def open(self) -> None:
+        """ Open all sessions concurrently, paced by `connect_rate` if set. """
+        start = perf_counter()
+        interval = 1 / self.connect_rate if self.connect_rate else 0.0
+
+        async def connect(index: int):
+            if interval:
+                await sleep(max(start + index * interval - perf_counter(), 0))
+            began = perf_counter()
+            session = await self.client.ws_connect(self.url, **self.kwargs)
+            self.connect_latency.record(perf_counter() - began)
+            return session
+
+        self.sessions = list(await gather(*[connect(i) for i in range(self.size)]))
+
+    async def close(self, timeout: Optional[float] = None) -> None:
+        """ Close all sessions concurrently. """
+        await gather(*[session.close(timeout=timeout) for session in self.sessions])
+
+    async def broadcast(self, message: Message) -> None:
+        """ Send `message` to the app from every session. """
+        await gather(*[session.send(message) for session in self.sessions])
+
+    async def collect(
+        self, expect: int = 1, timeout: Optional[float] = None
+    ) -> FanOutResult:
+        """ Receive `expect` messages on every session, latencies are measured
+            from the call. """
+        start = perf_counter()
+        latency = Histogram()
+
+        async def receive(session) -> None:
+            for _ in range(expect):
+                await wait_for(session.receive(), timeout)
+                latency.record(perf_counter() - start)
+
+        await gather(*[receive(session) for session in self.sessions])
+        return FanOutResult(len(self.sessions), perf_counter() - start, latency)
+
+    async def publish(
+        self,
+        message: Message,
+        via: int = 0,
+        expect: int = 1,
+        timeout: Optional[float] = None,
+    ) -> FanOutResult:
+        """ Send `message` from the session at index `via` and measure its
+            delivery: `expect` messages received on every session. """
+        start = perf_counter()
+        await self.sessions[via].send(message)
+        result = await self.collect(expect=expect, timeout=timeout)
+        result.elapsed = perf_counter() - start
+        return result
+
+    async def run(
+        self, script: Callable[[Any, int], Awaitable[None]]
+    ) -> FanOutResult:
+        """ Run `script(session, index)` on every session concurrently, the
+            latency histogram records how long each script took. """
+        start = perf_counter()
+        latency = Histogram()
+
+        async def run_one(session, index: int) -> None:
+            began = perf_counter()
+            await script(session, index)
+            latency.record(perf_counter() - began)
+
+        await gather(*[run_one(s, i) for i, s in enumerate(self.sessions)])
+        return FanOutResult(len(self.sessions), perf_counter() - start, latency)
@@ -0,0 +1,99 @@
+from asgi_testclient.types import (
+    Dict,
+    Headers,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    ReqHeaders,
+    Tuple,
+    Union,
+)
+
+
+class HeaderMap:
+    """ Case-insensitive multimap over raw ASGI `(bytes, bytes)` header pairs.
+        Pairs are kept as sent, names are indexed lowercased on the first
+        lookup and values only decoded (latin-1) when read. Works for response
+        headers as well as request ones (see `encode_headers`).
+
+        Indexing a missing name returns None, as `wsgiref.headers.Headers`. """
+
+    def __init__(self, raw: Optional[Iterable[Tuple[bytes, bytes]]] = None) -> None:
+        self.raw: List[Tuple[bytes, bytes]] = list(raw or [])
+        self._index: Optional[Dict[bytes, List[bytes]]] = None
+
+    def __repr__(self):
+        return f"HeaderMap({self.items()!r})"
+
+    def _lookup(self, name: str) -> List[bytes]:
+        if self._index is None:
+            index: Dict[bytes, List[bytes]] = {}
+            for key, value in self.raw:
+                index.setdefault(key.lower(), []).append(value)
+            self._index = index
+        return self._index.get(name.lower().encode("latin-1"), [])
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and bool(self._lookup(name))
+
+    def __getitem__(self, name: str) -> Optional[str]:
+        return self.get(name)
+
+    def __setitem__(self, name: str, value: str) -> None:
+        """ Replace every value of `name`. """
+        del self[name]
+        self.add(name, value)
+
+    def __delitem__(self, name: str) -> None:
+        """ Remove every value of `name`, missing names are ignored. """
+        key = name.lower().encode("latin-1")
+        self.raw = [pair for pair in self.raw if pair[0].lower() != key]
+        self._index = None
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, HeaderMap):
+            return self.raw == other.raw
+        return NotImplemented
+
+    def add(self, name: str, value: str) -> None:
+        """ Append a value, keeping the previous ones of `name`. """
+        self.raw.append((name.encode("latin-1"), value.encode("latin-1")))
+        self._index = None
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """ First value of `name`. """
+        values = self._lookup(name)
+        return values[0].decode("latin-1") if values else default
+
+    def get_list(self, name: str) -> List[str]:
+        """ All values of `name`, e.g. every `set-cookie`, in order. """
+        return [value.decode("latin-1") for value in self._lookup(name)]
+
+    get_all = get_list  # wsgiref.headers.Headers name
+
+    def keys(self) -> List[str]:
+        return [key.decode("latin-1") for key, _ in self.raw]
+
+    def values(self) -> List[str]:
+        return [value.decode("latin-1") for _, value in self.raw]
+
+    def items(self) -> List[Tuple[str, str]]:
+        return [(k.decode("latin-1"), v.decode("latin-1")) for k, v in self.raw]
+
+
+def encode_headers(headers: Union[Headers, HeaderMap]) -> ReqHeaders:
+    """ Raw ASGI pairs out of a dict, a list of pairs or a `HeaderMap`. """
+    if isinstance(headers, HeaderMap):
+        return list(headers.raw)
+    elif isinstance(headers, dict):
+        return [(k.encode(), v.encode()) for k, v in headers.items()]
+    elif isinstance(headers, list):
+        return [(k.encode(), v.encode()) for k, v in headers]
+    raise ValueError("Headers must be Dict or List objects")
@@ -0,0 +1,73 @@
+from asgi_testclient.types import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Receive,
+    Scope,
+    Send,
+    Tuple,
+)
+
+# Hooks and the arguments they're called with:
+#   - request: (scope) before the app is called.
+#   - receive: (scope, message) for every message the app receives.
+#   - send: (scope, message) for every message the app sends.
+#   - response: (response) once the response is ready, may return a new one.
+#   - exception: (scope, exception) when the app raises.
+# Websocket sessions call the same hooks, "websocket" is their scope type.
+HOOKS = ("request", "receive", "send", "response", "exception")
+
+Hooks = Dict[str, List[Callable]]
+
+
+def default_hooks() -> Hooks:
+    return {event: [] for event in HOOKS}
+
+
+def dispatch_hook(event: str, hooks: Hooks, data: Any, *args) -> Any:
+    """ Call the `event` hooks with `data`, a hook returning something other
+        than None replaces `data` for the following hooks. """
+    for hook in hooks[event]:
+        result = hook(data, *args)
+        if result is not None:
+            data = result
+    return data
+
+
+def wrap_channels(
+    scope: Scope, receive: Receive, send: Send, hooks: Hooks
+) -> Tuple[Receive, Send]:
+    """ Wrap the ASGI channels of an app call with the message hooks.
+        Channels are returned untouched when there are no hooks, so disabled
+        hooks add nothing to the hot path. """
+    if hooks["receive"]:
+        receive_hooks = hooks["receive"]
+        _receive = receive
+
+        async def receive():
+            message = await _receive()
+            for hook in receive_hooks:
+                hook(scope, message)
+            return message
+
+    if hooks["send"]:
+        send_hooks = hooks["send"]
+        _send = send
+
+        async def send(message):
+            for hook in send_hooks:
+                hook(scope, message)
+            await _send(message)
+
+    return receive, send
+
+
+async def catch_exceptions(app_call: Awaitable, scope: Scope, hooks: Hooks) -> None:
+    """ Await an app call, exceptions are passed to the hooks and re-raised. """
+    try:
+        await app_call
+    except Exception as ex:
+        dispatch_hook("exception", hooks, scope, ex)
+        raise
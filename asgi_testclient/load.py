@@ -0,0 +1,234 @@
+import math
+from asyncio import gather, sleep
+from collections import Counter
+from itertools import islice, repeat
+from time import perf_counter
+
+from asgi_testclient.types import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
+
+Scenario = Callable[[Any], Awaitable[Any]]
+
+
+class Histogram:
+    """ Constant memory latency histogram, HDR style.
+        Samples are kept in microseconds and bucketed keeping only their
+        `significant_bits` most significant bits. Percentiles are reported as
+        the middle of their bucket, so their relative error is bounded by
+        2^-significant_bits (0.78% with the default of 7 bits) plus the
+        microsecond rounding, no matter how many samples are recorded. """
+
+    def __init__(self, significant_bits: int = 7) -> None:
+        self.significant_bits = significant_bits
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._buckets: Dict[int, int] = {}
+
+    def __repr__(self):
+        return (
+            f"<Histogram count={self.count} p50={self.p50:.6f} "
+            f"p99={self.p99:.6f} max={self.max:.6f}>"
+        )
+
+    def record(self, seconds: float) -> None:
+        """ Add a sample, in seconds. """
+        value = int(seconds * 1000000)
+        shift = max(value.bit_length() - self.significant_bits, 0)
+        bucket = (value >> shift) << shift
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "Histogram") -> None:
+        """ Add all samples of `other` histogram into this one. """
+        for bucket, count in other._buckets.items():
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """ Value, in seconds, below which `percent` of the samples fall. """
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(self.count * percent / 100), 1)
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                width = 1 << max(bucket.bit_length() - self.significant_bits, 0)
+                middle = (bucket + width / 2) / 1000000
+                return min(max(middle, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p90(self) -> float:
+        return self.percentile(90)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+
+class LoadResult:
+    """ Outcome of a load run: latency histogram, status code and error counts. """
+
+    def __init__(
+        self,
+        elapsed: float,
+        latency: Histogram,
+        status_codes: Counter,
+        errors: Counter,
+    ) -> None:
+        self.elapsed = elapsed
+        self.latency = latency
+        self.status_codes = status_codes
+        self.errors = errors
+
+    def __repr__(self):
+        return (
+            f"<LoadResult requests={self.requests} "
+            f"throughput={self.throughput:.1f}/s p99={self.p99:.6f}>"
+        )
+
+    @property
+    def requests(self) -> int:
+        """ Number of requests issued, including failed ones. """
+        return self.latency.count
+
+    def merge(self, other: "LoadResult") -> None:
+        """ Add the requests of `other` into this result, `elapsed` is kept. """
+        self.latency.merge(other.latency)
+        self.status_codes.update(other.status_codes)
+        self.errors.update(other.errors)
+
+    @property
+    def throughput(self) -> float:
+        """ Requests per second. """
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def p50(self) -> float:
+        return self.latency.p50
+
+    @property
+    def p90(self) -> float:
+        return self.latency.p90
+
+    @property
+    def p99(self) -> float:
+        return self.latency.p99
+
+    @property
+    def max(self) -> float:
+        return self.latency.max
+
+    def summary(self) -> Dict[str, Any]:
+        """ Plain dict of the result, handy to dump or compare across runs. """
+        return {
+            "requests": self.requests,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "p50": self.p50,
+            "p90": self.p90,
+            "p99": self.p99,
+            "max": self.max,
+            "status_codes": dict(self.status_codes),
+            "errors": dict(self.errors),
+        }
+
+
+async def run_load(
+    client,
+    requests: Iterable[Union[Dict[str, Any], Scenario]],
+    concurrency: int = 10,
+    rate: Optional[float] = None,
+    duration: Optional[float] = None,
+    count: Optional[int] = None,
+) -> LoadResult:
+    """ Fire `requests` (an iterable of `TestClient.send` keyword arguments) at
+        the client's app from `concurrency` workers, until the iterable is
+        exhausted, `count` requests are issued or `duration` seconds elapse.
+
+        When `rate` (requests per second) is given each request has a scheduled
+        start and its latency is measured from it, so a stalled app is not
+        hidden by the workers waiting on it (coordinated omission).
+
+        Items are only pulled from `requests` when they are about to be issued,
+        so a generator stopped by `count` or `duration` can be resumed.
+        Items may also be scenarios, `async def scenario(client)` functions
+        making any number of calls, timed and counted as one request. """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+
+    source: Iterator[Union[Dict[str, Any], Scenario]] = iter(requests)
+    if count is not None:
+        source = islice(source, count)
+
+    latency = Histogram()
+    status_codes: Counter = Counter()
+    errors: Counter = Counter()
+    interval = 1 / rate if rate else 0.0
+    start = perf_counter()
+    deadline = start + duration if duration is not None else math.inf
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal issued
+        while True:
+            now = scheduled = perf_counter()
+            if interval:
+                scheduled = start + issued * interval
+            if scheduled >= deadline:
+                break  # Checked before pulling, so no request is dropped
+            kwargs = next(source, None)
+            if kwargs is None:
+                break
+            issued += 1
+            if scheduled > now:
+                await sleep(scheduled - now)
+            try:
+                if callable(kwargs):  # Scenario
+                    await kwargs(client)
+                elif kwargs.get("ws"):
+                    raise ValueError("Websocket requests can't be load tested")
+                else:
+                    response = await client.send(**kwargs)
+                    if response is None:
+                        errors["NoResponse"] += 1
+                    else:
+                        status_codes[response.status_code] += 1
+            except Exception as ex:
+                errors[type(ex).__name__] += 1
+            latency.record(perf_counter() - scheduled)
+
+    await gather(*[worker() for _ in range(concurrency)])
+    return LoadResult(perf_counter() - start, latency, status_codes, errors)
+
+
+def template(method: str, url: str, **kwargs) -> Iterator[Dict[str, Any]]:
+    """ Endless stream of the same request. """
+    return repeat(dict(kwargs, method=method, url=url))
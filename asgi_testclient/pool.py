@@ -0,0 +1,200 @@
+import asyncio
+import importlib
+import multiprocessing
+import os
+import queue
+import traceback
+from collections import Counter
+from itertools import repeat
+from time import perf_counter
+
+from asgi_testclient import load
+from asgi_testclient.client import TestClient
+from asgi_testclient.types import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+
+def import_string(path: str) -> Any:
+    """ Object at a "package.module:attribute.attribute" path. """
+    module_name, _, attribute = path.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f'Import path {path} must be like "package.module:app"')
+    obj = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def run_pool(
+    app: str,
+    requests: Optional[Sequence[Dict[str, Any]]] = None,
+    method: Optional[str] = None,
+    url: Optional[str] = None,
+    scenario: Optional[str] = None,
+    workers: Optional[int] = None,
+    concurrency: int = 10,
+    rate: Optional[float] = None,
+    duration: Optional[float] = None,
+    count: Optional[int] = None,
+    batch: int = 1000,
+    client_options: Optional[Dict[str, Any]] = None,
+    on_result: Optional[Callable[[int, load.LoadResult], None]] = None,
+    **kwargs,
+) -> load.LoadResult:
+    """ `run_load` sharded across `workers` processes (default one per CPU),
+        for apps whose own code keeps a single event loop busy.
+
+        Every worker imports `app` ("package.module:app"), opens a `TestClient`
+        with `client_options` and runs its lifespan once, then issues its shard:
+            - `requests`, a sequence of `send` keyword arguments dealt out
+              round-robin,
+            - or `method`, `url` and `send` kwargs repeated,
+            - or `scenario`, the import path of an `async def scenario(client)`
+              function, run repeatedly and timed as one request.
+        `count` is split between workers, `rate` too, `duration` and
+        `concurrency` apply to each worker.
+
+        Workers report a `LoadResult` every `batch` requests, passed to
+        `on_result(worker, result)` as they come and merged into the returned
+        one. Blocks until all workers are done, raises RuntimeError if any
+        failed. """
+    if sum(x is not None for x in (requests, url, scenario)) != 1:
+        raise ValueError("One of requests, method and url, or scenario is required")
+    if url is not None and method is None:
+        raise ValueError("Repeating a request requires a method")
+    if requests is None and duration is None and count is None:
+        raise ValueError("Repeating a request requires duration or count")
+    if kwargs.get("ws"):
+        raise ValueError("Websocket requests can't be load tested")
+
+    workers = workers or os.cpu_count() or 1
+    if requests is not None:
+        requests = list(requests[:count] if count is not None else requests)
+        workers = max(min(workers, len(requests)), 1)
+    template = dict(kwargs, method=method, url=url) if url is not None else None
+
+    context = multiprocessing.get_context("spawn")  # No loop state is inherited
+    results = context.Queue()
+    processes: Dict[int, Any] = {}
+    for index in range(workers):
+        shard_count = None
+        if count is not None and requests is None:
+            shard_count = count // workers + (index < count % workers)
+            if not shard_count:
+                continue
+        options = {
+            "requests": requests[index::workers] if requests is not None else None,
+            "template": template,
+            "scenario": scenario,
+            "count": shard_count,
+            "concurrency": concurrency,
+            "rate": rate / workers if rate else None,
+            "duration": duration,
+            "batch": batch,
+        }
+        process = context.Process(
+            target=_worker,
+            args=(index, app, client_options or {}, options, results),
+            name=f"asgi-testclient-worker-{index}",
+            daemon=True,
+        )
+        processes[index] = process
+
+    total = load.LoadResult(0.0, load.Histogram(), Counter(), Counter())
+    start = perf_counter()
+    for process in processes.values():
+        process.start()
+    failures: List[str] = []
+    running = dict(processes)
+    try:
+        while running:
+            try:
+                index, kind, payload = results.get(timeout=0.1)
+            except queue.Empty:
+                for index, process in list(running.items()):
+                    if process.exitcode:  # Died without reporting
+                        del running[index]
+                        failures.append(f"Worker {index} exited {process.exitcode}")
+                continue
+            if kind == "result":
+                total.merge(payload)
+                if on_result is not None:
+                    on_result(index, payload)
+            else:
+                running.pop(index, None)
+                if kind == "error":
+                    failures.append(payload)
+    finally:
+        for process in running.values():
+            process.terminate()
+        for process in processes.values():
+            process.join()
+    total.elapsed = perf_counter() - start
+    if failures:
+        raise RuntimeError(f"{len(failures)} worker(s) failed:\n{failures[0]}")
+    return total
+
+
+def _worker(
+    index: int,
+    app: str,
+    client_options: Dict[str, Any],
+    options: Dict[str, Any],
+    results: Any,
+) -> None:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(
+            _run_worker(index, app, client_options, options, results)
+        )
+    except BaseException:
+        results.put((index, "error", traceback.format_exc()))
+    else:
+        results.put((index, "done", None))
+    finally:
+        loop.close()
+
+
+async def _run_worker(
+    index: int,
+    app: str,
+    client_options: Dict[str, Any],
+    options: Dict[str, Any],
+    results: Any,
+) -> None:
+    if options["requests"] is not None:
+        source: Any = iter(options["requests"])
+    elif options["scenario"] is not None:
+        source = repeat(import_string(options["scenario"]))
+    else:
+        source = load.template(**options["template"])
+    count, duration, batch = options["count"], options["duration"], options["batch"]
+    deadline = perf_counter() + duration if duration is not None else None
+
+    async with TestClient(import_string(app), **client_options) as client:
+        while True:
+            size = batch if count is None else min(batch, count)
+            remaining = None if deadline is None else deadline - perf_counter()
+            if not size or (remaining is not None and remaining <= 0):
+                break
+            result = await load.run_load(
+                client,
+                source,
+                concurrency=options["concurrency"],
+                rate=options["rate"],
+                duration=remaining,
+                count=size,
+            )
+            if result.requests:
+                results.put((index, "result", result))
+            if result.requests < size:  # Source exhausted or out of time
+                break
+            if count is not None:
+                count -= result.requests
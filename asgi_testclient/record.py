@@ -0,0 +1,262 @@
+import json
+import time
+from asyncio import gather, sleep
+from time import perf_counter
+
+from asgi_testclient.client import Exchange, Response
+from asgi_testclient.types import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Message,
+    Optional,
+    Scope,
+    Tuple,
+    Union,
+)
+
+Result = Union[Optional[Response], List[Message]]
+
+IDS_KEY = "asgi_testclient.recorder_ids"  # Scope key, exchange id per recorder
+
+
+class Recorder:
+    """ Records the ASGI traffic of a client into an append-only JSON lines
+        file, one event per line: {"id", "t", "event", "data"} where event is
+        "scope", "receive" (message to the app) or "send" (message from the
+        app) and `t` the seconds since the recorder was created.
+        Every recorder starts with a "session" line, ids and `t` restart there.
+        Bytes longer than `inline_limit` go to a `<path>.bin` side-file and are
+        referenced as {"$f": [offset, length]}, shorter ones are inlined as
+        {"$b": latin-1 text}. """
+
+    def __init__(self, path: str, inline_limit: int = 1024) -> None:
+        self.path = path
+        self.inline_limit = inline_limit
+        self._file = open(path, "a")
+        self._blobs = open(f"{path}.bin", "ab")
+        self._next_id = 0
+        self._start = perf_counter()
+        self._write_line(None, "session", {"time": time.time()})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def attach(self, client) -> "Recorder":
+        """ Record every HTTP and websocket call of `client`. """
+        client.register_hook("request", self._on_request)
+        client.register_hook("receive", self._on_receive)
+        client.register_hook("send", self._on_send)
+        return self
+
+    def close(self) -> None:
+        self._file.close()
+        self._blobs.close()
+
+    def _encode(self, value: Any) -> Any:
+        if isinstance(value, (bytes, bytearray)):
+            if len(value) <= self.inline_limit:
+                return {"$b": bytes(value).decode("latin-1")}
+            offset = self._blobs.tell()
+            self._blobs.write(value)
+            return {"$f": [offset, len(value)]}
+        if isinstance(value, dict):
+            return {
+                k: self._encode(v)
+                for k, v in value.items()
+                if k not in ("state", IDS_KEY)
+            }
+        if isinstance(value, (list, tuple)):
+            return [self._encode(v) for v in value]
+        return value
+
+    def _write(self, scope: Scope, event: str, data: Any) -> None:
+        self._write_line(scope.get(IDS_KEY, {}).get(id(self)), event, data)
+
+    def _write_line(self, exchange: Optional[int], event: str, data: Any) -> None:
+        record = {
+            "id": exchange,
+            "t": perf_counter() - self._start,
+            "event": event,
+            "data": self._encode(data),
+        }
+        self._file.write(json.dumps(record, default=str) + "\n")
+
+    def _on_request(self, scope: Scope) -> None:
+        # Kept in the scope, so it goes away with the exchange
+        scope.setdefault(IDS_KEY, {})[id(self)] = self._next_id
+        self._next_id += 1
+        self._write(scope, "scope", scope)
+
+    def _on_receive(self, scope: Scope, message: Message) -> None:
+        self._write(scope, "receive", message)
+
+    def _on_send(self, scope: Scope, message: Message) -> None:
+        self._write(scope, "send", message)
+
+
+def read(path: str) -> Iterator[dict]:
+    """ Iterate over the events of a recording, with bytes restored and the
+        index of their recorder session in "session". """
+    blobs: Optional[Any] = None
+
+    def decode(value: Any) -> Any:
+        nonlocal blobs
+        if isinstance(value, dict):
+            if "$b" in value:
+                return value["$b"].encode("latin-1")
+            if "$f" in value:
+                if blobs is None:
+                    blobs = open(f"{path}.bin", "rb")
+                offset, length = value["$f"]
+                blobs.seek(offset)
+                return blobs.read(length)
+            return {k: decode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [decode(v) for v in value]
+        return value
+
+    session = sessions = 0
+    try:
+        with open(path) as f:
+            for line in f:
+                record = json.loads(line)
+                if record["event"] == "session":
+                    session, sessions = sessions, sessions + 1
+                    continue
+                record["session"] = session
+                record["data"] = decode(record["data"])
+                yield record
+    finally:
+        if blobs is not None:
+            blobs.close()
+
+
+class Recording:
+    """ Events of one recorded exchange. """
+
+    def __init__(self, session: int, id: int, start: float, scope: Scope) -> None:
+        self.session = session
+        self.id = id
+        self.start = start  # Seconds since the recording began
+        self.scope = scope
+        self.received: List[Tuple[float, Message]] = []  # (t, message to app)
+        self.sent: List[Message] = []  # Messages from the app
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return self.session, self.id
+
+    @property
+    def status_code(self) -> Optional[int]:
+        for message in self.sent:
+            if message["type"] == "http.response.start":
+                return message["status"]
+        return None
+
+    @property
+    def content(self) -> bytes:
+        return b"".join(
+            message.get("body", b"")
+            for message in self.sent
+            if message["type"] == "http.response.body"
+        )
+
+
+class Replayer:
+    """ Re-issues recorded traffic against the app of a client. Sessions of
+        a file recorded to several times are replayed one after the other. """
+
+    def __init__(self, path: str) -> None:
+        recordings: Dict[Tuple[int, int], Recording] = {}
+        session, offset, end = 0, 0.0, 0.0
+        for record in read(path):
+            if record["session"] != session:
+                session, offset = record["session"], end
+            t = offset + record["t"]
+            end = max(end, t)
+            key = (session, record["id"])
+            if record["event"] == "scope":
+                scope = record["data"]
+                scope["headers"] = [tuple(header) for header in scope["headers"]]
+                recordings[key] = Recording(session, record["id"], t, scope)
+            elif key in recordings:
+                recording = recordings[key]
+                if record["event"] == "receive":
+                    recording.received.append((t, record["data"]))
+                else:
+                    recording.sent.append(record["data"])
+        self.recordings = sorted(recordings.values(), key=lambda r: r.start)
+
+    async def replay(self, client, speed: Optional[float] = 1.0) -> List[Result]:
+        """ Replay every exchange, starting each at its recorded offset divided
+            by `speed` (None replays as fast as possible). Returns a response
+            per HTTP exchange, the messages the app sent per websocket one. """
+        if not self.recordings:
+            return []
+        origin = self.recordings[0].start
+        started = perf_counter()
+
+        async def wait_until(t: float) -> None:
+            if speed:
+                delay = (t - origin) / speed - (perf_counter() - started)
+                if delay > 0:
+                    await sleep(delay)
+
+        async def replay_one(recording: Recording) -> Result:
+            await wait_until(recording.start)
+            scope = dict(recording.scope)
+            if scope["type"] == "websocket":
+                return await self._replay_websocket(
+                    client, recording, scope, wait_until
+                )
+            return await self._replay_http(client, recording, scope)
+
+        return list(await gather(*[replay_one(r) for r in self.recordings]))
+
+    async def _replay_http(self, client, recording: Recording, scope: Scope) -> Result:
+        async def body() -> AsyncIterator[bytes]:
+            for _, message in recording.received:
+                if message["type"] == "http.request":
+                    yield message.get("body", b"")
+
+        exchange = Exchange(scope["path"], body())
+        await client._run_app(scope, exchange)
+        return exchange.response
+
+    async def _replay_websocket(
+        self, client, recording: Recording, scope: Scope, wait_until
+    ) -> Result:
+        session = client.ws_class(
+            client.app, scope, client.raise_server_exceptions, hooks=client.hooks
+        )
+        await session._start()
+        for t, message in recording.received[1:]:  # First one is the connect
+            await wait_until(t)
+            if message["type"] == "websocket.disconnect":
+                break
+            await session.send(message)
+        await session.close()
+        messages = []
+        while not session._client.empty():
+            messages.append(session._client.get_nowait())
+        return messages
+
+    def diff(self, results: List[Result]) -> List[Tuple[Tuple[int, int], str]]:
+        """ Exchanges whose replay differs from the recording, as
+            ((session, id), reason). """
+        differences = []
+        for recording, result in zip(self.recordings, results):
+            if isinstance(result, list):
+                if result != recording.sent[1:]:  # Skip the accept
+                    differences.append((recording.key, "messages"))
+            elif result is None or result.status_code != recording.status_code:
+                differences.append((recording.key, "status_code"))
+            elif result.content != recording.content:
+                differences.append((recording.key, "content"))
+        return differences
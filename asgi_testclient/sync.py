@@ -1,38 +1,80 @@
 import asyncio
-import json
+import threading
 from asgi_testclient import client
-from asgi_testclient.types import Optional
+from asgi_testclient.types import Any, Awaitable, Optional
+
+
+def run(loop: asyncio.AbstractEventLoop, coro: Awaitable) -> Any:
+    """ Run a coroutine to completion on `loop`. Loops already running belong
+        to a `Portal` thread, the coroutine is then submitted thread-safely. """
+    if loop.is_running():
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()  # type: ignore
+    return loop.run_until_complete(coro)
+
+
+class Portal:
+    """ Event loop running forever in a daemon thread.
+        Coroutines are submitted from any thread and waited on with thread-safe
+        futures, so tasks spawned by the app keep running between calls. """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, name="asgi-testclient-portal", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def call(self, coro: Awaitable) -> Any:
+        return run(self.loop, coro)
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
 
 
 class WsSession(client.WsSession):
-    def __init__(self, *args):
+    def __init__(self, *args, **kwargs):
         self._loop = asyncio.get_event_loop()
-        super().__init__(*args)
+        super().__init__(*args, **kwargs)
 
     def send_text(self, message: str) -> None:  # type: ignore
-        self._loop.run_until_complete(super().send_text(message))
+        run(self._loop, super().send_text(message))
 
     def receive_text(self) -> Optional[str]:  # type: ignore
-        return self._loop.run_until_complete(super().receive_text())
+        return run(self._loop, super().receive_text())
 
     def send_bytes(self, message: bytes) -> None:  # type: ignore
-        self._loop.run_until_complete(super().send_bytes(message))
+        run(self._loop, super().send_bytes(message))
 
     def receive_bytes(self) -> Optional[bytes]:  # type: ignore
-        return self._loop.run_until_complete(super().receive_bytes())
+        return run(self._loop, super().receive_bytes())
 
-    def send_json(self, message: str) -> None:  # type: ignore
-        _message = {"type": "websocket.receive", "text": json.dumps(message)}
-        self._loop.run_until_complete(super().send(_message))
+    def send_json(self, message) -> None:  # type: ignore
+        run(self._loop, super().send_json(message))
 
     def receive_json(self):
-        return self._loop.run_until_complete(super().receive_json())
+        return run(self._loop, super().receive_json())
 
-    def close(self):
-        return self._loop.run_until_complete(super().close())
+    def __iter__(self):
+        while True:
+            try:
+                yield run(self._loop, super().receive())
+            except client.WsDisconnect:
+                return
 
+    def send_many(self, messages) -> None:  # type: ignore
+        run(self._loop, super().send_many(messages))
 
-client.WsSession = WsSession  # type: ignore
+    def receive_many(self, count: int, timeout: Optional[float] = None):  # type: ignore
+        return run(self._loop, super().receive_many(count, timeout=timeout))
+
+    def close(self, code: int = 1000, timeout: Optional[float] = None):
+        return run(self._loop, super().close(code=code, timeout=timeout))
 
 
 class WsContextManager(client.WsContextManager):
@@ -43,9 +85,30 @@ class WsContextManager(client.WsContextManager):
         return self.ws_session.close()
 
 
+class PreparedRequest(client.PreparedRequest):
+    def send(self, *args, **kwargs):  # type: ignore
+        return self.client._run(super().send(*args, **kwargs))
+
+
 class TestClient(client.TestClient):
-    def __init__(self, *args, **kwargs) -> None:
+    """ Sync client, runs the app on the current thread event loop between
+        calls, or with `portal=True` on a loop of its own running in a
+        background thread (see `Portal`). A portal client can be shared by any
+        number of threads, their calls are multiplexed on the app loop. """
+
+    ws_class = WsSession
+    prepared_class = PreparedRequest
+
+    def __init__(self, *args, portal: bool = False, **kwargs) -> None:
         super().__init__(*args, **kwargs)
+        self.portal: Optional[Portal] = None
+        self._thread = threading.get_ident()
+        self._lock = threading.Lock()
+        if portal:
+            self.portal = Portal()
+            self.loop = self.portal.loop
+            return
+
         try:
             self.loop = asyncio.get_event_loop()
         except RuntimeError:  # Allow run in threads
@@ -55,46 +118,76 @@ class TestClient(client.TestClient):
         if self.loop.is_running():  # If running is an async app, why use this clas?
             raise RuntimeError("Event loop already running. User async client.")
 
+    def _run(self, coro: Awaitable) -> Any:
+        if self.portal is None and threading.get_ident() != self._thread:
+            coro.close()  # type: ignore
+            raise RuntimeError(
+                "Client used from another thread than the one that created it. "
+                "Use TestClient(app, portal=True) to share it across threads."
+            )
+        return run(self.loop, coro)
+
+    def close(self) -> None:
+        """ Stop the portal thread, if any. Safe to call from any thread. """
+        with self._lock:
+            portal, self.portal = self.portal, None
+        if portal is not None:
+            portal.stop()
+
+    def __enter__(self):
+        return self._run(self.__aenter__())
+
+    def __exit__(self, *args):
+        self._run(self.__aexit__(*args))
+
     def get(self, url, **kwargs):
-        response = self.loop.run_until_complete(self.send("GET", url, **kwargs))
+        response = self._run(self.send("GET", url, **kwargs))
         return response
 
     def options(self, url, **kwargs):
-        response = self.loop.run_until_complete(self.send("OPTIONS", url, **kwargs))
+        response = self._run(self.send("OPTIONS", url, **kwargs))
         return response
 
     def head(self, url, **kwargs):
-        response = self.loop.run_until_complete(self.send("HEAD", url, **kwargs))
+        response = self._run(self.send("HEAD", url, **kwargs))
         return response
 
     def post(self, url, data=None, json=None, **kwargs):
-        response = self.loop.run_until_complete(
+        response = self._run(
             self.send("POST", url, data=data, json=json, **kwargs)
         )
         return response
 
     def put(self, url, data=None, **kwargs):
-        response = self.loop.run_until_complete(
-            self.send("PUT", url, data=data, **kwargs)
-        )
+        response = self._run(self.send("PUT", url, data=data, **kwargs))
         return response
 
     def delete(self, url, **kwargs):
-        response = self.loop.run_until_complete(self.send("DELETE", url, **kwargs))
+        response = self._run(self.send("DELETE", url, **kwargs))
         return response
 
     def patch(self, url, **kwargs):
-        response = self.loop.run_until_complete(self.send("PATCH", url, **kwargs))
+        response = self._run(self.send("PATCH", url, **kwargs))
         return response
 
+    def run_load(self, *args, **kwargs):
+        return self._run(super().run_load(*args, **kwargs))
+
     def ws_connect(self, url, subprotocols=None, **kwargs):
-        websocket = self.loop.run_until_complete(
-            self.send("GET", url, subprotocols=subprotocols, ws=True, **kwargs)
+        websocket = self._run(
+            self.send("GET", url, subprotocols=subprotocols, ws=True, **kwargs),
         )
         return websocket
 
+    def close_all(self, timeout=None):
+        self._run(super().close_all(timeout=timeout))
+
+    def _close_session(self, session, timeout):
+        # Already on the loop, the sync `WsSession.close` would wait on itself
+        return client.WsSession.close(session, timeout=timeout)
+
     def ws_session(self, url, subprotocols=None, **kwargs):
-        ws_session = self.loop.run_until_complete(
-            self.send("GET", url, subprotocols=subprotocols, ws=True, **kwargs)
+        ws_session = self._run(
+            self.send("GET", url, subprotocols=subprotocols, ws=True, **kwargs),
         )
         return WsContextManager(ws_session)
@@ -13,6 +13,8 @@ ASGI3App = Callable[[Scope, Receive, Send], Awaitable[None]]
 
 Headers = Union[Dict[str, str], List[Tuple[str, str]]]
 ReqHeaders = List[Tuple[bytes, bytes]]
-ResHeaders = List[Tuple[str, str]]
+ResHeaders = Iterable[Tuple[bytes, bytes]]
 Params = Union[Dict[str, str], List[Tuple[str, str]]]
 Url = Tuple[str, str, int, str, bytes]
+Body = Union[bytes, AsyncIterator[bytes]]
+Content = Union[str, bytes, IO, Iterable[bytes], AsyncIterable[bytes]]
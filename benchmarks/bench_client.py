@@ -0,0 +1,130 @@
+""" Benchmarks of the client own overhead, run with:
+
+    pytest benchmarks/bench_client.py --benchmark-autosave
+
+and compare with previous runs adding `--benchmark-compare`. Apps are minimal
+raw ASGI callables, so timings are dominated by the client. """
+import asyncio
+import pytest
+
+from asgi_testclient import TestClient
+from asgi_testclient.sync import TestClient as SyncTestClient
+
+pytest.importorskip("pytest_benchmark")
+
+
+async def hello(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"hello"})
+
+
+async def echo(scope, receive, send):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    headers = [(b"content-type", b"application/json")]
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def chunks(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    for _ in range(10000):
+        await send({"type": "http.response.body", "body": b"x" * 16, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def ws_echo(scope, receive, send):
+    await receive()
+    await send({"type": "websocket.accept"})
+    while True:
+        message = await receive()
+        if message["type"] == "websocket.disconnect":
+            break
+        await send({"type": "websocket.send", "text": message["text"]})
+
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_round_trip(benchmark, loop):
+    client = TestClient(hello)
+    response = benchmark(lambda: loop.run_until_complete(client.get("/")))
+    assert response.content == b"hello"
+
+
+def test_round_trip_prepared(benchmark, loop):
+    client = TestClient(hello)
+    prepared = client.prepare("GET", "/")
+    response = benchmark(lambda: loop.run_until_complete(prepared.send()))
+    assert response.content == b"hello"
+
+
+def test_round_trip_sync(benchmark):
+    client = SyncTestClient(hello)
+    response = benchmark(client.get, "/")
+    assert response.content == b"hello"
+
+
+def test_round_trip_portal(benchmark):
+    client = SyncTestClient(hello, portal=True)
+    try:
+        response = benchmark(client.get, "/")
+    finally:
+        client.close()
+    assert response.content == b"hello"
+
+
+@pytest.mark.parametrize("codec", ["json", "auto"])
+def test_large_json(benchmark, loop, codec):
+    client = TestClient(echo, json_codec=codec)
+    payload = {"items": [{"id": i, "name": f"item {i}"} for i in range(10000)]}
+
+    async def post():
+        response = await client.post("/", json=payload)
+        return response.json()
+
+    assert benchmark(lambda: loop.run_until_complete(post())) == payload
+
+
+def test_many_chunks(benchmark, loop):
+    client = TestClient(chunks)
+
+    async def get():
+        return (await client.get("/")).content
+
+    assert len(benchmark(lambda: loop.run_until_complete(get()))) == 160000
+
+
+def test_prepare_url_and_headers(benchmark):
+    client = TestClient(hello)
+    params = {f"param{i}": f"value {i}" for i in range(50)}
+    headers = {f"x-header-{i}": f"value-{i}" for i in range(50)}
+
+    def prepare():
+        url = client.prepare_url("/path?existing=1", params=params)
+        return url, client.prepare_headers(url[1], headers)
+
+    url, prepared = benchmark(prepare)
+    assert len(prepared) == 55
+
+
+def test_websocket_throughput(benchmark, loop):
+    client = TestClient(ws_echo)
+    messages = [str(i) for i in range(1000)]
+
+    async def exchange():
+        websocket = await client.ws_connect("/")
+        await websocket.send_many(messages)
+        received = await websocket.receive_many(len(messages))
+        await websocket.close()
+        return received
+
+    assert len(benchmark(lambda: loop.run_until_complete(exchange()))) == 1000
@@ -1,8 +1,10 @@
+import asyncio
+import io
 import pytest
 from starlette.applications import Starlette
 from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
-from asgi_testclient import TestClient, HTTPError
+from asgi_testclient import TestClient, HTTPError, Timeout
 from asgi_testclient.client import Response
 
 
@@ -38,6 +40,26 @@ async def json(request):
     return JSONResponse(await request.json())
 
 
+@app.route("/upload", methods=["POST", "PUT"])
+async def upload(request):
+    chunks = [len(chunk) async for chunk in request.stream() if chunk]
+    return JSONResponse(
+        {"chunks": chunks, "encoding": request.headers.get("transfer-encoding")}
+    )
+
+
+@app.route("/files", methods=["POST"])
+async def files(request):
+    form = await request.form()
+    response = {}
+    for key, value in form.multi_items():
+        if hasattr(value, "filename"):
+            content = await value.read()
+            value = [value.filename, value.content_type, content.decode()]
+        response.setdefault(key, []).append(value)
+    return JSONResponse(response)
+
+
 @app.route("/data", methods=["POST", "PUT", "PATCH"])
 async def data(request):
     form = await request.form()
@@ -53,6 +75,55 @@ async def strem(request):
     return StreamingResponse(gen())
 
 
+@app.route("/echo/{value}")
+async def echo(request):
+    await asyncio.sleep(0.01)
+    return PlainTextResponse(request.path_params["value"] * 1000)
+
+
+@app.route("/events")
+async def events(request):
+    async def gen():
+        for i in range(3):
+            yield f"data: {i}\n\n"
+            await asyncio.sleep(0.01)
+
+    return StreamingResponse(gen(), media_type="text/event-stream")
+
+
+@app.route("/stream/long")
+async def stream_long(request):
+    async def gen():
+        for i in range(40):
+            yield f"{i}\n"
+            await asyncio.sleep(0.001)
+
+    return StreamingResponse(gen())
+
+
+@app.route("/stream/error")
+async def stream_error(request):
+    async def gen():
+        yield "partial"
+        raise ValueError("error")
+
+    return StreamingResponse(gen())
+
+
+@app.route("/hang")
+async def hang(request):
+    await asyncio.sleep(10)
+
+
+@app.route("/hang/body")
+async def hang_body(request):
+    async def gen():
+        yield "partial"
+        await asyncio.sleep(10)
+
+    return StreamingResponse(gen())
+
+
 @app.route("/server")
 async def server(request):
     return JSONResponse({"hello": "world"}, status_code=501)
@@ -110,6 +181,68 @@ async def test_get_content(client):
     assert response.content == (b"=" * 10)
 
 
+@pytest.mark.asyncio
+async def test_stream_bytes(client):
+    response = await client.get("/stream", stream=True)
+    assert response.status_code == 200
+    assert response.content == b""
+
+    chunks = [chunk async for chunk in response.aiter_bytes()]
+    assert chunks == [b"="] * 10
+
+
+@pytest.mark.asyncio
+async def test_stream_lines(client):
+    response = await client.get("/events", stream=True)
+    lines = [line async for line in response.aiter_lines()]
+    assert lines == ["data: 0", "", "data: 1", "", "data: 2", ""]
+
+
+@pytest.mark.asyncio
+async def test_stream_beyond_buffer(client):
+    response = await client.get("/stream/long", stream=True)
+    lines = [line async for line in response.aiter_lines()]
+    assert lines == [str(i) for i in range(40)]
+
+    response = await client.get("/stream/long", stream=True)
+    await asyncio.sleep(0.1)  # Let the app fill the buffer
+    assert await response.aread() == "".join(f"{i}\n" for i in range(40)).encode()
+
+
+@pytest.mark.asyncio
+async def test_stream_consumed(client):
+    response = await client.get("/stream", stream=True)
+    await response.aread()
+    with pytest.raises(RuntimeError):
+        async for chunk in response.aiter_bytes():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_stream_read(client):
+    response = await client.get("/stream", stream=True)
+    assert await response.aread() == b"=" * 10
+    assert response.content == b"=" * 10
+
+    response = await client.get("/text")
+    assert await response.aread() == b"testing content"
+
+
+@pytest.mark.asyncio
+async def test_stream_close(client):
+    async with await client.get("/events", stream=True) as response:
+        async for line in response.aiter_lines():
+            break
+    assert response._task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_stream_raise(client):
+    response = await client.get("/stream/error", stream=True)
+    with pytest.raises(ValueError):
+        await response.aread()
+
+
 @pytest.mark.asyncio
 async def test_get_args(client):
     params = {"name": "test", "age": "1", "space": " str"}
@@ -120,6 +253,24 @@ async def test_get_args(client):
     assert response.json() == ["test2", "test"]
 
 
+@pytest.mark.asyncio
+async def test_prepared(client):
+    prepared = client.prepare("GET", "/args?name=test", headers={"x-token": "abc"})
+    template = list(prepared.scope["headers"])
+
+    response = await prepared.send()
+    assert response.json() == {"name": "test"}
+    response = await prepared.send(params={"age": "1"})
+    assert response.json() == {"name": "test", "age": "1"}
+    assert prepared.scope["headers"] == template  # Template left untouched
+
+    prepared = client.prepare("POST", "/json").clone(headers={"x-token": "abc"})
+    response = await prepared.send(json={"user": "test"})
+    assert response.json() == {"user": "test"}
+    response = await client.prepare("GET", "/headers").clone({"x-token": "abc"}).send()
+    assert ["x-token", "abc"] in response.json()
+
+
 @pytest.mark.asyncio
 async def test_post_json(client):
     json = {"user": "test", "age": "1", "pass": "123456"}
@@ -134,6 +285,62 @@ async def test_post_data(client):
     assert response.json() == data
 
 
+@pytest.mark.asyncio
+async def test_post_content(client):
+    response = await client.post("/upload", content=b"x" * 10)
+    assert response.json() == {"chunks": [10], "encoding": None}
+
+    response = await client.post("/upload", content="text")
+    assert response.json()["chunks"] == [4]
+
+
+@pytest.mark.asyncio
+async def test_post_stream_iterables(client):
+    async def agen():
+        for _ in range(3):
+            yield b"x" * 5
+
+    response = await client.post("/upload", content=agen())
+    assert response.json() == {"chunks": [5, 5, 5], "encoding": "chunked"}
+
+    response = await client.post("/upload", content=(s for s in ["ab", "cd"]))
+    assert response.json()["chunks"] == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_post_stream_file():
+    client = TestClient(app, chunk_size=4)
+    response = await client.put("/upload", content=io.BytesIO(b"x" * 10))
+    assert response.json()["chunks"] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_post_files():
+    client = TestClient(app, chunk_size=3)
+
+    def gen():
+        yield b"gen"
+        yield b"erated"
+
+    report = io.BytesIO(b"a,b\n1,2\n")
+    report.name = "/tmp/report.csv"
+    files = {
+        "report": report,
+        "raw": b"raw bytes",
+        "gen": ("gen.bin", gen(), "application/x-test"),
+    }
+    data = {"user": "test", "tag": ["a", "b"]}
+    response = await client.post("/files", data=data, files=files)
+
+    assert response.json() == {
+        "user": ["test"],
+        "tag": ["a", "b"],
+        "report": [["report.csv", "text/csv", "a,b\n1,2\n"]],
+        "raw": [["raw", "application/octet-stream", "raw bytes"]],
+        "gen": [["gen.bin", "application/x-test", "generated"]],
+    }
+
+
 @pytest.mark.asyncio
 async def test_put_json(client):
     json = {"user": "test", "age": "1", "pass": "123456"}
@@ -176,6 +383,27 @@ async def test_response_str(client):
     assert str(response) == "<Response [200]>"
 
 
+@pytest.mark.asyncio
+async def test_concurrent_requests(client):
+    values = [str(i) for i in range(100)]
+    responses = await asyncio.gather(*[client.get(f"/echo/{v}") for v in values])
+    assert [r.text for r in responses] == [v * 1000 for v in values]
+    assert all(r.url == f"/echo/{v}" for r, v in zip(responses, values))
+
+
+def test_response_chunks():
+    response = Response("url", 200, [])
+    for _ in range(1000):
+        response.content = b"ab"
+    response.content = b""
+
+    assert response.content == b"ab" * 1000
+    response.content = b"c"
+    assert response.content == b"ab" * 1000 + b"c"
+    assert response.view[-3:] == b"abc"
+    assert response.view.readonly
+
+
 def test_response_invalid_json():
     respose = Response("url", 200, [])
     respose.content = b")(_)(_*)(_*9"
@@ -209,3 +437,59 @@ async def test_client_bad_netloc():
     client = TestClient(app, base_url="http:netloc")
     with pytest.raises(ValueError):
         await client.get("/nonetloc")
+
+
+@pytest.mark.asyncio
+async def test_timeout(client):
+    with pytest.raises(Timeout) as error:
+        await client.get("/hang", timeout=0.01)
+    assert error.value.elapsed >= 0.01
+    assert error.value.pending == '"http.response.start"'
+    assert "GET /hang timed out" in str(error.value)
+
+    with pytest.raises(Timeout, match="http.response.body"):
+        await client.get("/hang/body", timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_client_timeout():
+    client = TestClient(app, timeout=0.01)
+    with pytest.raises(Timeout):
+        await client.get("/hang")
+    with pytest.raises(Timeout):
+        await client.get("/hang", stream=True)
+    assert (await client.get("/text")).text == "testing content"
+
+
+@pytest.mark.asyncio
+async def test_slow_calls():
+    client = TestClient(app, slow_threshold=0.005)
+    await client.get("/text")
+    await client.get("/echo/1")
+    assert [call for call, elapsed in client.slow_calls] == ["GET /echo/1"]
+    assert client.slow_calls[0][1] > 0.005
+
+
+@pytest.mark.asyncio
+async def test_timings(client):
+    response = await client.post("/json", json={"a": 1})
+    timings = response.timings
+
+    assert timings.app_call <= timings.first_receive <= timings.response_start
+    assert timings.response_start <= timings.first_body <= timings.last_body
+    assert timings.bytes_sent == len(b'{"a": 1}')
+    assert timings.bytes_received == len(response.content)
+    assert timings.chunks == 1
+    assert response.elapsed.total_seconds() == pytest.approx(timings.total, abs=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_stream_timings(client):
+    response = await client.get("/stream/long", stream=True)
+    assert response.timings.time_to_start is not None
+    await response.aread()
+
+    assert response.timings.chunks == 40
+    assert response.timings.bytes_received == len(response.content)
+    assert response.timings.time_to_first_byte < response.timings.total
+    assert Response("url", 200, []).elapsed.total_seconds() == 0
@@ -0,0 +1,107 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+
+from asgi_testclient import TestClient
+from asgi_testclient.codec import CODECS, PREFERRED, JSONCodec, get_codec
+
+
+app = Starlette()
+
+
+@app.route("/json", methods=["POST"])
+async def json(request):
+    return Response(await request.body(), media_type="application/json")
+
+
+@app.route("/float")
+async def float_(request):
+    return JSONResponse({"value": 1.5})
+
+
+@app.websocket_route("/ws")
+async def ws(websocket):
+    await websocket.accept()
+    await websocket.send_json(await websocket.receive_json())
+    await websocket.close()
+
+
+class Recording(JSONCodec):
+    """ Stdlib codec keeping track of its calls. """
+
+    def __init__(self):
+        self.calls = []
+
+    def dumps(self, obj):
+        self.calls.append("dumps")
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.calls.append(("loads", type(data)))
+        return super().loads(data)
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_round_trip(name):
+    if name != "json":
+        pytest.importorskip(name)
+    codec = get_codec(name)
+    data = {"list": [1, 2.5, None, True], "text": "ñ"}
+
+    encoded = codec.dumps(data)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == codec.loads(encoded.decode()) == data
+    with pytest.raises(ValueError):
+        codec.loads(b"{not json")
+
+
+def test_get_codec():
+    assert get_codec().name == "json"
+    installed = [name for name in PREFERRED if _installed(name)]
+    assert get_codec("auto").name == (installed[0] if installed else "json")
+    codec = Recording()
+    assert get_codec(codec) is codec
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+@pytest.mark.asyncio
+async def test_client_codec():
+    codec = Recording()
+    client = TestClient(app, json_codec=codec)
+    response = await client.post("/json", json={"a": 1})
+
+    assert response.json() == {"a": 1}
+    assert codec.calls == ["dumps", ("loads", bytes)]  # No str in between
+
+    response = await client.get("/float")
+    assert response.json(parse_float=str) == {"value": "1.5"}  # Stdlib options
+    response = await client.post("/json", content=b"{not json")
+    with pytest.raises(ValueError):
+        response.json()
+
+
+@pytest.mark.asyncio
+async def test_default_codec():
+    client = TestClient(app)  # Same bytes whatever is installed
+    response = await client.post("/json", json={1: "a"})
+    assert response.content == b'{"1": "a"}'
+
+
+@pytest.mark.asyncio
+async def test_websocket_codec():
+    codec = Recording()
+    client = TestClient(app, json_codec=codec)
+    websocket = await client.ws_connect("/ws")
+    await websocket.send_json({"a": 1})
+    assert await websocket.receive_json() == {"a": 1}
+    await websocket.close()
+    assert codec.calls == ["dumps", ("loads", str)]
+
+
+def _installed(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
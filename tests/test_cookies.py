@@ -0,0 +1,123 @@
+import time
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from asgi_testclient import TestClient
+from asgi_testclient.cookies import CookieJar, default_path
+
+
+app = Starlette()
+logins = []
+
+
+@app.route("/login", methods=["POST"])
+async def login(request):
+    logins.append(1)
+    response = PlainTextResponse("ok")
+    response.set_cookie("session", "secret", httponly=True)
+    response.set_cookie("theme", "dark", path="/account")
+    return response
+
+
+@app.route("/logout")
+async def logout(request):
+    response = PlainTextResponse("bye")
+    response.delete_cookie("session")
+    return response
+
+
+@app.route("/me")
+async def me(request):
+    return JSONResponse(request.cookies)
+
+
+@app.route("/account/settings")
+async def settings(request):
+    return JSONResponse(request.cookies)
+
+
+@app.websocket_route("/ws")
+async def ws(websocket):
+    await websocket.accept()
+    await websocket.send_json(websocket.cookies)
+    await websocket.close()
+
+
+@pytest.mark.asyncio
+async def test_session():
+    client = TestClient(app)
+    assert (await client.get("/me")).json() == {}
+
+    await client.post("/login")
+    assert client.cookies.get("session") == "secret"
+    assert (await client.get("/me")).json() == {"session": "secret"}
+    response = await client.get("/account/settings")
+    assert response.json() == {"session": "secret", "theme": "dark"}
+
+    websocket = await client.ws_connect("/ws")
+    assert await websocket.receive_json() == {"session": "secret"}
+    await websocket.close()
+
+    await client.get("/logout")
+    assert "session" not in client.cookies
+    assert (await client.get("/me")).json() == {}
+
+
+@pytest.mark.asyncio
+async def test_snapshot():
+    logins.clear()
+    client = TestClient(app)
+    await client.post("/login")
+    session = client.cookies.snapshot()
+
+    await client.get("/logout")
+    client.cookies.restore(session)
+    assert (await client.get("/me")).json() == {"session": "secret"}
+
+    other = TestClient(app, cookies=session)  # Reused, no login
+    prepared = other.prepare("GET", "/me")
+    for _ in range(3):
+        assert (await prepared.send()).json() == {"session": "secret"}
+    assert logins == [1]
+
+
+@pytest.mark.asyncio
+async def test_seed():
+    client = TestClient(app, cookies={"session": "seeded"})
+    assert (await client.get("/me")).json() == {"session": "seeded"}
+
+    response = await client.get("/me", headers={"cookie": "explicit=1"})
+    assert response.json() == {"explicit": "1"}  # Given header wins
+
+    await client.post("/login")  # Replaces the seeded one
+    assert (await client.get("/me")).json() == {"session": "secret"}
+
+
+def test_matching():
+    jar = CookieJar()
+    jar.extract("testserver", "/", ["host=1", "sub=1; Domain=.testserver"])
+    jar.extract("testserver", "/", ["other=1; Domain=example.com"])  # Ignored
+    jar.extract("testserver", "/a/b", ["deep=1", "safe=1; Secure"])
+
+    assert jar.header("testserver", "/", "http") == b"host=1; sub=1"
+    assert jar.header("api.testserver", "/", "http") == b"sub=1"
+    header = jar.header("testserver", "/a/c", "https")
+    assert header == b"deep=1; safe=1; host=1; sub=1"  # Longest path first
+    assert jar.header("testserver", "/ab", "http") == b"host=1; sub=1"
+    assert jar.header("example.com", "/", "http") is None
+
+    jar.extract("testserver", "/", ["host=1; Max-Age=0"])
+    jar.extract("testserver", "/", ["sub=1; Domain=testserver; Expires=" + gmt(-10)])
+    jar.extract("testserver", "/", ["later=1; Expires=" + gmt(3600)])
+    assert [cookie.name for cookie in jar] == ["deep", "safe", "later"]
+
+
+def test_default_path():
+    assert default_path("/") == "/"
+    assert default_path("/login") == "/"
+    assert default_path("/account/login") == "/account"
+
+
+def gmt(offset):
+    return time.strftime("%a, %d-%b-%Y %H:%M:%S GMT", time.gmtime(time.time() + offset))
@@ -0,0 +1,128 @@
+import gzip
+import sys
+import zlib
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import PlainTextResponse, StreamingResponse
+
+from asgi_testclient import DecodingError, TestClient
+from asgi_testclient.encoding import get_decoder
+
+
+app = Starlette()
+app.add_middleware(GZipMiddleware, minimum_size=100)
+
+TEXT = "compressible " * 1000
+
+
+@app.route("/text")
+async def text(request):
+    return PlainTextResponse(TEXT)
+
+
+@app.route("/small")
+async def small(request):
+    return PlainTextResponse("small")
+
+
+@app.route("/stream")
+async def stream(request):
+    async def gen():
+        for _ in range(10):
+            yield TEXT
+
+    return StreamingResponse(gen())
+
+
+def encoded_app(body, encoding, chunk_size=100):
+    async def app(scope, receive, send):
+        headers = [(b"content-encoding", encoding.encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for i in range(0, len(body), chunk_size):
+            chunk = body[i : i + chunk_size]
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_gzip():
+    response = await TestClient(app).get("/text")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == TEXT
+
+    timings = response.timings
+    assert timings.bytes_decoded == len(TEXT)
+    assert timings.bytes_received == int(response.headers["content-length"])
+    assert timings.compression_ratio > 10
+    assert timings.decode_time > 0
+
+    response = await TestClient(app).get("/small")  # Below minimum size
+    assert "content-encoding" not in response.headers
+    assert response.timings.compression_ratio == 1
+
+
+@pytest.mark.asyncio
+async def test_gzip_stream():
+    response = await TestClient(app).get("/stream", stream=True)
+    chunks = [chunk async for chunk in response.aiter_bytes()]
+    assert b"".join(chunks) == TEXT.encode() * 10
+    assert response.timings.chunks > 1
+
+
+@pytest.mark.asyncio
+async def test_raw():
+    response = await TestClient(app, decode_content=False).get("/text")
+    assert gzip.decompress(response.content).decode() == TEXT
+    assert response.timings.bytes_decoded == response.timings.bytes_received
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body, encoding",
+    [
+        (zlib.compress(TEXT.encode()), "deflate"),
+        (zlib.compress(TEXT.encode())[2:-4], "deflate"),  # Raw deflate
+        (zlib.compress(gzip.compress(TEXT.encode())), "gzip, deflate"),
+        (TEXT.encode(), "identity"),
+        (b"unknown", "compress"),  # Left untouched
+    ],
+)
+async def test_encodings(body, encoding):
+    response = await TestClient(encoded_app(body, encoding)).get("/")
+    assert response.content == (b"unknown" if encoding == "compress" else TEXT.encode())
+
+
+@pytest.mark.asyncio
+async def test_brotli():
+    brotli = pytest.importorskip("brotli")
+    body = brotli.compress(TEXT.encode())
+    response = await TestClient(encoded_app(body, "br", chunk_size=10)).get("/")
+    assert response.text == TEXT
+
+
+@pytest.mark.asyncio
+async def test_brotli_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "brotli", None)
+    monkeypatch.setitem(sys.modules, "brotlicffi", None)
+    assert get_decoder("br") is None
+    response = await TestClient(encoded_app(b"raw", "br")).get("/")
+    assert response.content == b"raw"  # Left as sent
+
+
+@pytest.mark.asyncio
+async def test_corrupt():
+    with pytest.raises(DecodingError) as error:
+        await TestClient(encoded_app(b"not gzip", "gzip")).get("/")
+    assert "gzip response body" in str(error.value)
+
+
+def test_get_decoder():
+    assert get_decoder(None) is None
+    assert get_decoder("identity") is None
+    assert get_decoder("gzip, compress") is None
+    decoder = get_decoder("GZip")
+    decoded = b"".join(decoder.decode(bytes([b])) for b in gzip.compress(b"data"))
+    assert decoded + decoder.flush() == b"data"
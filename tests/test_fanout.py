@@ -0,0 +1,69 @@
+import pytest
+
+from asgi_testclient import TestClient
+
+
+class PubSub:
+    """ Every message received is sent to all connected sockets. """
+
+    def __init__(self):
+        self.subscribers = set()
+
+    async def __call__(self, scope, receive, send):
+        assert scope["type"] == "websocket"
+        await receive()  # websocket.connect
+        await send({"type": "websocket.accept"})
+        self.subscribers.add(send)
+        try:
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                for subscriber in list(self.subscribers):
+                    await subscriber({"type": "websocket.send", "text": message["text"]})
+        finally:
+            self.subscribers.discard(send)
+
+
+@pytest.fixture
+def app():
+    return PubSub()
+
+
+@pytest.mark.asyncio
+async def test_publish(app):
+    client = TestClient(app)
+    async with client.ws_fanout("/", sessions=100) as fanout:
+        assert len(app.subscribers) == 100
+        assert fanout.connect_latency.count == 100
+
+        result = await fanout.publish({"type": "websocket.receive", "text": "hi"})
+        assert result.sessions == 100
+        assert result.messages == 100
+        assert 0 < result.p50 <= result.p99 <= result.max
+        assert result.throughput > 0
+
+    assert not app.subscribers
+    assert all(session.closed for session in fanout.sessions)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_collect(app):
+    client = TestClient(app)
+    async with client.ws_fanout("/", sessions=10) as fanout:
+        await fanout.broadcast({"type": "websocket.receive", "text": "hi"})
+        result = await fanout.collect(expect=10, timeout=1)
+        assert result.messages == 100
+
+
+@pytest.mark.asyncio
+async def test_run_script(app):
+    async def script(session, index):
+        await session.send({"type": "websocket.receive", "text": str(index)})
+
+    client = TestClient(app)
+    async with client.ws_fanout("/", sessions=5, connect_rate=500) as fanout:
+        result = await fanout.run(script)
+        assert result.messages == 5
+        result = await fanout.collect(expect=5)
+        assert result.summary()["messages"] == 25
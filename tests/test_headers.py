@@ -0,0 +1,72 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+
+from asgi_testclient import TestClient
+from asgi_testclient.headers import HeaderMap, encode_headers
+
+
+app = Starlette()
+
+
+@app.route("/cookies")
+async def cookies(request):
+    response = Response("ok", headers={"X-Custom": "value"})
+    response.set_cookie("a", "1")
+    response.set_cookie("b", "2")
+    return response
+
+
+@app.route("/headers")
+async def headers(request):
+    return JSONResponse(request.headers.getlist("x-many"))
+
+
+def test_lookup():
+    headers = HeaderMap([(b"Content-Type", b"text/plain"), (b"x-many", b"1")])
+    headers.add("X-Many", "2")
+
+    assert headers["content-type"] == headers.get("CONTENT-TYPE") == "text/plain"
+    assert headers["missing"] is None
+    assert headers.get("missing", "default") == "default"
+    assert headers.get_list("x-many") == ["1", "2"]
+    assert "X-MANY" in headers and "missing" not in headers
+    assert headers.keys() == ["Content-Type", "x-many", "X-Many"]
+    assert len(headers) == 3
+
+
+def test_mutation():
+    headers = HeaderMap([(b"x-many", b"1"), (b"x-many", b"2")])
+    headers["X-Many"] = "3"
+    assert headers.get_list("x-many") == ["3"]
+
+    del headers["x-many"]
+    del headers["missing"]
+    assert headers.raw == [] and "x-many" not in headers
+
+
+def test_encode():
+    raw = [(b"x-token", b"abc")]
+    assert encode_headers({"x-token": "abc"}) == raw
+    assert encode_headers([("x-token", "abc")]) == raw
+    assert encode_headers(HeaderMap(raw)) == raw
+    with pytest.raises(ValueError):
+        encode_headers("x-token")  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_response_headers():
+    response = await TestClient(app).get("/cookies")
+    assert isinstance(response.headers, HeaderMap)
+    assert response.headers["x-custom"] == "value"
+    assert len(response.headers.get_list("Set-Cookie")) == 2
+    assert all(isinstance(pair[0], bytes) for pair in response.headers.raw)
+
+
+@pytest.mark.asyncio
+async def test_request_headers():
+    headers = HeaderMap()
+    headers.add("x-many", "1")
+    headers.add("x-many", "2")
+    response = await TestClient(app).get("/headers", headers=headers)
+    assert response.json() == ["1", "2"]
@@ -0,0 +1,101 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.websockets import WebSocket
+
+from asgi_testclient import TestClient
+from asgi_testclient.client import Response
+from asgi_testclient.hooks import default_hooks, wrap_channels
+
+
+app = Starlette()
+
+
+@app.route("/")
+async def index(request):
+    return PlainTextResponse("ok")
+
+
+@app.route("/error")
+async def error(request):
+    raise ValueError("error")
+
+
+@app.websocket_route("/ws")
+async def ws(websocket: WebSocket):
+    await websocket.accept()
+    await websocket.send_text(await websocket.receive_text())
+    await websocket.close()
+
+
+def test_disabled_hooks_cost_nothing():
+    async def receive():
+        pass
+
+    async def send(message):
+        pass
+
+    assert wrap_channels({}, receive, send, default_hooks()) == (receive, send)
+
+
+@pytest.mark.asyncio
+async def test_http_hooks():
+    events = []
+    client = TestClient(
+        app,
+        hooks={
+            "request": lambda scope: events.append(("request", scope["path"])),
+            "receive": lambda scope, message: events.append(message["type"]),
+            "send": [lambda scope, message: events.append(message["type"])],
+        },
+    )
+    client.register_hook("response", lambda response: events.append(response.text))
+    await client.get("/")
+
+    assert events == [
+        ("request", "/"),
+        "http.response.start",
+        "http.response.body",
+        "ok",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_response_hook_replaces():
+    replacement = Response("url", 204, [])
+    client = TestClient(app, hooks={"response": lambda response: replacement})
+    assert await client.get("/") is replacement
+
+
+@pytest.mark.asyncio
+async def test_exception_hook():
+    errors = []
+    client = TestClient(app, raise_server_exceptions=False)
+    client.register_hook("exception", lambda scope, ex: errors.append(ex))
+    await client.get("/error")
+    assert isinstance(errors[0], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_websocket_hooks():
+    messages = []
+    client = TestClient(app)
+    client.register_hook("receive", lambda scope, m: messages.append(("in", m["type"])))
+    client.register_hook("send", lambda scope, m: messages.append(("out", m["type"])))
+    websocket = await client.ws_connect("/ws")
+    await websocket.send_text("hi")
+    assert await websocket.receive_text() == "hi"
+    await websocket.close()
+
+    assert messages == [
+        ("in", "websocket.connect"),
+        ("out", "websocket.accept"),
+        ("in", "websocket.receive"),
+        ("out", "websocket.send"),
+        ("out", "websocket.close"),
+    ]
+
+
+def test_invalid_hook():
+    with pytest.raises(ValueError):
+        TestClient(app, hooks={"nope": print})
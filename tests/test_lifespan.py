@@ -0,0 +1,81 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+
+from asgi_testclient import TestClient
+
+
+app = Starlette()
+events = []
+
+
+@app.on_event("startup")
+async def startup():
+    events.append("startup")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    events.append("shutdown")
+
+
+@app.route("/")
+async def index(request):
+    return JSONResponse(events)
+
+
+async def state_app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                scope["state"]["pool"] = "connected"
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    else:
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": scope["state"]["pool"].encode()})
+
+
+async def failing_app(scope, receive, send):
+    await receive()
+    await send({"type": "lifespan.startup.failed", "message": "no database"})
+
+
+async def no_lifespan_app(scope, receive, send):
+    assert scope["type"] == "http"
+    await send({"type": "http.response.start", "status": 204, "headers": []})
+    await send({"type": "http.response.body"})
+
+
+@pytest.mark.asyncio
+async def test_lifespan_events():
+    events.clear()
+    async with TestClient(app) as client:
+        for _ in range(3):
+            response = await client.get("/")
+            assert response.json() == ["startup"]
+    assert events == ["startup", "shutdown"]
+
+
+@pytest.mark.asyncio
+async def test_lifespan_state():
+    async with TestClient(state_app) as client:
+        response = await client.get("/")
+        assert response.text == "connected"
+
+
+@pytest.mark.asyncio
+async def test_lifespan_failed():
+    with pytest.raises(RuntimeError, match="no database"):
+        async with TestClient(failing_app):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_lifespan_not_supported():
+    async with TestClient(no_lifespan_app) as client:
+        response = await client.get("/")
+        assert response.status_code == 204
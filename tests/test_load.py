@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+
+from asgi_testclient import TestClient
+from asgi_testclient.load import Histogram
+
+
+app = Starlette()
+
+
+@app.route("/")
+async def index(request):
+    return PlainTextResponse("ok")
+
+
+@app.route("/slow")
+async def slow(request):
+    await asyncio.sleep(0.01)
+    return PlainTextResponse("slow")
+
+
+@app.route("/error")
+async def error(request):
+    raise ValueError("error")
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.min == 0.001
+    assert histogram.max == 1.0
+    assert histogram.p50 == pytest.approx(0.5, rel=0.01)
+    assert histogram.p90 == pytest.approx(0.9, rel=0.01)
+    assert histogram.p99 == pytest.approx(0.99, rel=0.01)
+    assert histogram.mean == pytest.approx(0.5005)
+
+
+def test_histogram_error_bound():
+    for exponent in range(60):
+        seconds = 0.0001 * 1.2 ** exponent
+        histogram = Histogram()
+        for sample in (0.000001, seconds, 100):
+            histogram.record(sample)
+        error = abs(histogram.p50 - seconds) / seconds
+        assert error <= 2 ** -7 + 0.000001 / seconds
+
+
+def test_histogram_merge():
+    first, second = Histogram(), Histogram()
+    first.record(0.1)
+    second.record(0.3)
+    first.merge(second)
+
+    assert first.count == 2
+    assert first.max == 0.3
+    assert first.min == 0.1
+
+
+@pytest.mark.asyncio
+async def test_run_load_count(client):
+    result = await client.run_load("GET", "/", concurrency=5, count=50)
+
+    assert result.requests == 50
+    assert result.status_codes == {200: 50}
+    assert not result.errors
+    assert result.throughput > 0
+    assert 0 < result.p50 <= result.p90 <= result.p99 <= result.max
+
+
+@pytest.mark.asyncio
+async def test_run_load_concurrency(client):
+    result = await client.run_load("GET", "/slow", concurrency=20, count=20)
+    # All requests in flight at once, not serialized.
+    assert result.elapsed < 20 * 0.01
+
+
+@pytest.mark.asyncio
+async def test_run_load_requests(client):
+    requests = [{"method": "GET", "url": "/"}, {"method": "GET", "url": "/nope"}]
+    result = await client.run_load(requests=requests * 5)
+
+    assert result.status_codes == {200: 5, 404: 5}
+    assert result.summary()["requests"] == 10
+
+
+@pytest.mark.asyncio
+async def test_run_load_rate_duration(client):
+    result = await client.run_load("GET", "/", rate=100, duration=0.2)
+    assert 15 <= result.requests <= 21
+
+
+@pytest.mark.asyncio
+async def test_run_load_errors(client):
+    result = await client.run_load("GET", "/error", count=3)
+    assert result.errors == {"ValueError": 3}
+
+
+@pytest.mark.asyncio
+async def test_run_load_requires_bound(client):
+    with pytest.raises(ValueError):
+        await client.run_load("GET", "/")
+
+
+@pytest.mark.asyncio
+async def test_run_load_resumable_source(client):
+    source = iter([{"method": "GET", "url": "/"}] * 10)
+    result = await client.run_load(requests=source, concurrency=3, count=4)
+
+    assert result.requests == 4
+    assert len(list(source)) == 6
+
+
+@pytest.mark.asyncio
+async def test_run_load_websocket(client):
+    with pytest.raises(ValueError):
+        await client.run_load("GET", "/", ws=True, count=1)
+
+    result = await client.run_load(requests=[{"method": "GET", "url": "/", "ws": True}])
+    assert result.errors == {"ValueError": 1}
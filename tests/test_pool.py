@@ -0,0 +1,83 @@
+import os
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from asgi_testclient.pool import import_string, run_pool
+
+
+app = Starlette()
+startups = []
+
+
+@app.on_event("startup")
+async def startup():
+    startups.append(os.getpid())
+
+
+@app.route("/")
+async def index(request):
+    return PlainTextResponse("ok")
+
+
+@app.route("/nope")
+async def nope(request):
+    return PlainTextResponse("nope", status_code=404)
+
+
+@app.route("/startups")
+async def count(request):
+    return JSONResponse(startups)
+
+
+async def scenario(client):
+    response = await client.get("/startups")
+    assert response.json() == [os.getpid()]  # Lifespan ran once, in the worker
+    await client.get("/")
+
+
+APP = f"{__name__}:app"
+
+
+def test_import_string():
+    assert import_string(APP) is app
+    assert import_string("os.path:join.__name__") == "join"
+    with pytest.raises(ValueError):
+        import_string("os.path")
+
+
+def test_requests():
+    requests = [{"method": "GET", "url": "/"}, {"method": "GET", "url": "/nope"}]
+    reported = []
+    result = run_pool(
+        APP,
+        requests=requests * 10,
+        workers=2,
+        batch=3,
+        on_result=lambda worker, result: reported.append(worker),
+    )
+
+    assert result.status_codes == {200: 10, 404: 10}
+    assert result.requests == 20
+    assert sorted(set(reported)) == [0, 1]
+    assert len(reported) == 8  # Results streamed in batches
+
+
+def test_template_and_scenario():
+    result = run_pool(APP, method="GET", url="/", workers=3, count=10)
+    assert result.status_codes == {200: 10}
+
+    result = run_pool(APP, scenario=f"{__name__}:scenario", workers=2, count=6)
+    assert result.requests == 6
+    assert not result.errors
+
+
+def test_failures():
+    with pytest.raises(ValueError):
+        run_pool(APP, method="GET", url="/")
+    with pytest.raises(ValueError):
+        run_pool(APP, requests=[], method="GET", url="/")
+
+    with pytest.raises(RuntimeError) as error:
+        run_pool(f"{__name__}:missing", method="GET", url="/", workers=1, count=1)
+    assert "AttributeError" in str(error.value)
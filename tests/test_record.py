@@ -0,0 +1,109 @@
+import json
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.websockets import WebSocket
+
+from asgi_testclient import TestClient
+from asgi_testclient.record import Recorder, Replayer, read
+
+
+app = Starlette()
+version = {"value": 1}
+
+
+@app.route("/")
+async def index(request):
+    return PlainTextResponse(f"v{version['value']}")
+
+
+@app.route("/big", methods=["POST"])
+async def big(request):
+    body = await request.body()
+    return JSONResponse({"size": len(body)})
+
+
+@app.websocket_route("/ws")
+async def ws(websocket: WebSocket):
+    await websocket.accept()
+    message = await websocket.receive_text()
+    await websocket.send_text(message.upper())
+    await websocket.close()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "traffic.jsonl")
+
+
+async def record(path):
+    version["value"] = 1
+    client = TestClient(app)
+    with Recorder(path).attach(client):
+        await client.get("/")
+        await client.post("/big", content=b"x" * 5000)
+        websocket = await client.ws_connect("/ws")
+        await websocket.send_text("hi")
+        await websocket.receive_text()
+        await websocket.close()
+    return path
+
+
+@pytest.mark.asyncio
+async def test_record(path):
+    recorded = await record(path)
+    events = list(read(recorded))
+    assert [e["event"] for e in events if e["id"] == 0] == ["scope", "send", "send"]
+    assert events[0]["data"]["path"] == "/"
+
+    upload = [e for e in events if e["id"] == 1 and e["event"] == "receive"][0]
+    assert upload["data"]["body"] == b"x" * 5000
+
+    with open(recorded) as f:  # Large bodies live in the side-file
+        assert all(len(line) < 2000 for line in f)
+        f.seek(0)
+        assert "$f" in f.read()
+
+
+@pytest.mark.asyncio
+async def test_replay(path):
+    recorded = await record(path)
+    replayer = Replayer(recorded)
+    results = await replayer.replay(TestClient(app), speed=None)
+
+    assert results[0].text == "v1"
+    assert results[1].json() == {"size": 5000}
+    assert [m.get("text") for m in results[2]] == ["HI", None]
+    assert replayer.diff(results) == []
+
+
+@pytest.mark.asyncio
+async def test_replay_diff(path):
+    recorded = await record(path)
+    version["value"] = 2
+    replayer = Replayer(recorded)
+    results = await replayer.replay(TestClient(app), speed=10)
+    assert replayer.diff(results) == [((0, 0), "content")]
+
+
+@pytest.mark.asyncio
+async def test_sessions(path):
+    await record(path)
+    await record(path)  # Appended, ids start over
+    events = list(read(path))
+    assert [e["session"] for e in events if e["event"] == "scope"] == [0, 0, 0, 1, 1, 1]
+
+    replayer = Replayer(path)
+    assert [r.key for r in replayer.recordings] == [
+        (0, 0),
+        (0, 1),
+        (0, 2),
+        (1, 0),
+        (1, 1),
+        (1, 2),
+    ]
+    assert replayer.recordings[3].start >= replayer.recordings[2].start
+    assert all("asgi_testclient.recorder_ids" not in e["data"] for e in events)
+    results = await replayer.replay(TestClient(app), speed=None)
+    assert [r.text for r in (results[0], results[3])] == ["v1", "v1"]
+    assert replayer.diff(results) == []
@@ -0,0 +1,145 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, RedirectResponse
+
+from asgi_testclient import HTTPError, RedirectLoop, TestClient, TooManyRedirects
+
+
+app = Starlette()
+
+
+@app.route("/redirect/{code:int}", methods=["GET", "POST", "PUT", "HEAD"])
+async def redirect(request):
+    return RedirectResponse("/echo", status_code=request.path_params["code"])
+
+
+@app.route("/echo", methods=["GET", "POST", "PUT", "HEAD"])
+async def echo(request):
+    return JSONResponse(
+        {
+            "method": request.method,
+            "body": (await request.body()).decode(),
+            "authorization": request.headers.get("authorization"),
+        }
+    )
+
+
+@app.route("/chain/{hops:int}")
+async def chain(request):
+    hops = request.path_params["hops"]
+    if not hops:
+        return PlainTextResponse("done")
+    return RedirectResponse(f"{hops - 1}")  # Relative location
+
+
+@app.route("/loop")
+async def loop(request):
+    return RedirectResponse("/loop")
+
+
+@app.route("/login")
+async def login(request):
+    if "session" in request.cookies:
+        return PlainTextResponse("welcome")
+    return RedirectResponse("/set-cookie")
+
+
+@app.route("/set-cookie")
+async def set_cookie(request):
+    response = RedirectResponse("/login")
+    response.set_cookie("session", "1")
+    return response
+
+
+@app.route("/external")
+async def external(request):
+    return RedirectResponse("http://cdn.testserver/echo")
+
+
+@pytest.fixture
+def client():
+    return TestClient(app, follow_redirects=True)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "code, method, expected",
+    [
+        (301, "POST", "GET"),
+        (302, "POST", "GET"),
+        (302, "PUT", "PUT"),
+        (303, "PUT", "GET"),
+        (307, "POST", "POST"),
+        (308, "PUT", "PUT"),
+    ],
+)
+async def test_methods(client, code, method, expected):
+    response = await client.send(method, f"/redirect/{code}", content="data")
+    assert response.json()["method"] == expected
+    assert response.json()["body"] == ("data" if code in (307, 308) else "")
+    assert [r.status_code for r in response.history] == [code]
+
+
+@pytest.mark.asyncio
+async def test_not_followed():
+    client = TestClient(app)
+    response = await client.get("/redirect/302")
+    assert response.status_code == 302 and response.is_redirect
+    assert response.history == []
+
+    response = await client.get("/redirect/302", follow_redirects=True)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_history(client):
+    response = await client.get("/chain/3")
+    assert response.text == "done"
+    assert [r.url for r in response.history] == [
+        "http://testserver/chain/3",
+        "http://testserver/chain/2",
+        "http://testserver/chain/1",
+    ]
+    assert response.url == "http://testserver/chain/0"
+    hops = [r.elapsed for r in response.history] + [response.elapsed]
+    assert response.total_elapsed == sum(hops[1:], hops[0])
+
+    response = await client.get("/chain/3", stream=True)
+    assert await response.aread() == b"done"
+    assert response.history[0].content == b""
+
+
+@pytest.mark.asyncio
+async def test_limits(client):
+    client.max_redirects = 2
+    with pytest.raises(TooManyRedirects) as error:
+        await client.get("/chain/3")
+    assert len(error.value.history) == 3
+
+    with pytest.raises(RedirectLoop):
+        await client.get("/loop")
+
+    client.max_redirects = 20
+    response = await client.get("/login")  # Revisited, with a cookie
+    assert response.text == "welcome"
+    assert len(response.history) == 2
+
+
+@pytest.mark.asyncio
+async def test_cross_host(client):
+    headers = {"authorization": "secret"}
+    response = await client.get("/redirect/302", headers=headers)
+    assert response.json()["authorization"] == "secret"
+    response = await client.get("/external", headers=headers)
+    assert response.json()["authorization"] is None
+
+
+@pytest.mark.asyncio
+async def test_streamed_body(client):
+    async def body():
+        yield b"data"
+
+    with pytest.raises(HTTPError):
+        await client.post("/redirect/307", content=body())
+    response = await client.post("/redirect/302", content=body())
+    assert response.json() == {"method": "GET", "body": "", "authorization": None}
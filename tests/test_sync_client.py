@@ -1,4 +1,6 @@
+import asyncio
 import concurrent.futures
+import time
 import pytest
 from starlette.applications import Starlette
 from starlette.responses import JSONResponse
@@ -16,6 +18,25 @@ async def index(request):
     return JSONResponse({"hello": "world"})
 
 
+background = []
+
+
+@app.route("/background")
+async def spawn(request):
+    async def work():
+        await asyncio.sleep(0.01)
+        background.append("done")
+
+    asyncio.ensure_future(work())
+    return JSONResponse({"hello": "world"})
+
+
+@app.route("/slow")
+async def slow(request):
+    await asyncio.sleep(0.05)
+    return JSONResponse(id(asyncio.get_event_loop()))
+
+
 @pytest.fixture(scope="module")
 def client_class():
     from asgi_testclient.sync import TestClient
@@ -36,6 +57,73 @@ def test_methods(client):
         assert response.json() == {"hello": "world"}
 
 
+@pytest.mark.sync
+def test_prepared(client):
+    prepared = client.prepare("POST", "/")
+    for _ in range(3):
+        assert prepared.send(json={}).json() == {"hello": "world"}
+
+
+@pytest.mark.sync
+def test_lifespan(client_class):
+    events = []
+    lifespan_app = Starlette()
+    lifespan_app.add_event_handler("startup", lambda: events.append("startup"))
+    lifespan_app.add_event_handler("shutdown", lambda: events.append("shutdown"))
+
+    with client_class(lifespan_app) as client:
+        assert events == ["startup"]
+        assert client.get("/").status_code == 404
+    assert events == ["startup", "shutdown"]
+
+
+@pytest.mark.sync
+def test_portal_methods(client_class):
+    client = client_class(app, portal=True)
+    try:
+        assert client.loop.is_running()
+        for method in ["GET", "POST", "PUT", "DELETE", "OPTIONS"]:
+            response = getattr(client, method.lower())("/")
+            assert response.json() == {"hello": "world"}
+    finally:
+        client.close()
+    assert client.loop.is_closed()
+
+
+@pytest.mark.sync
+def test_portal_background_tasks(client_class):
+    background.clear()
+    client = client_class(app, portal=True)
+    try:
+        client.get("/background")
+        time.sleep(0.1)  # No client call, the app loop keeps running
+        assert background == ["done"]
+    finally:
+        client.close()
+
+
+@pytest.mark.sync
+def test_portal_shared_by_threads(client_class):
+    client = client_class(app, portal=True)
+    try:
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as pool:
+            responses = list(pool.map(lambda _: client.get("/slow"), range(20)))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 20 * 0.05  # Requests overlapped on the app loop
+        assert {response.json() for response in responses} == {id(client.loop)}
+    finally:
+        client.close()
+
+
+@pytest.mark.sync
+def test_other_thread_without_portal(client):
+    with concurrent.futures.ThreadPoolExecutor() as pool:
+        with pytest.raises(RuntimeError, match="portal=True"):
+            pool.submit(client.get, "/").result()
+
+
 @pytest.mark.sync
 @pytest.mark.asyncio
 async def test_loop_running(client_class):
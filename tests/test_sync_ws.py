@@ -1,5 +1,5 @@
 import pytest
-from starlette.websockets import WebSocket
+from starlette.websockets import WebSocket, WebSocketDisconnect
 
 
 class App:
@@ -23,6 +23,18 @@ class App:
         await websocket.close()
 
 
+class Echo:
+    async def __call__(self, scope, receive, send):
+        websocket = WebSocket(scope, receive=receive, send=send)
+        await websocket.accept()
+        while True:
+            try:
+                message = await websocket.receive_text()
+            except WebSocketDisconnect:
+                break
+            await websocket.send_text(message)
+
+
 @pytest.fixture(scope="module")
 def client():
     from asgi_testclient.sync import TestClient
@@ -59,3 +71,47 @@ def test_ws_context(client):
     with client.ws_session("/") as websocket:
         data = websocket.receive_text()
         assert data == "Hello, world!"
+
+
+@pytest.mark.sync
+def test_portal_ws():
+    from asgi_testclient.sync import TestClient
+
+    client = TestClient(App, portal=True)
+    try:
+        websocket = client.ws_connect("/bytes")
+        websocket.send_bytes(b"test")
+        assert websocket.receive_bytes() == b"test"
+        websocket.close()
+    finally:
+        client.close()
+
+
+@pytest.mark.sync
+def test_send_receive_many():
+    from asgi_testclient.sync import TestClient
+
+    websocket = TestClient(Echo()).ws_connect("/")
+    websocket.send_many(["a", "b", "c"])
+    assert [m["text"] for m in websocket.receive_many(3)] == ["a", "b", "c"]
+    websocket.close()
+
+
+@pytest.mark.sync
+def test_iter_messages(client):
+    websocket = client.ws_connect("/")
+    assert [message["text"] for message in websocket] == ["Hello, world!"]
+
+
+@pytest.mark.sync
+@pytest.mark.parametrize("portal", [False, True])
+def test_close_all(portal):
+    from asgi_testclient.sync import TestClient
+
+    client = TestClient(Echo(), portal=portal)
+    try:
+        websockets = [client.ws_connect("/") for _ in range(3)]
+        client.close_all(timeout=1)
+        assert all(websocket.closed for websocket in websockets)
+    finally:
+        client.close()
@@ -1,7 +1,10 @@
+import asyncio
+import time
 import pytest
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
-from asgi_testclient import TestClient, WsDisconnect
+from asgi_testclient import TestClient, WsDisconnect, Timeout
+from asgi_testclient.client import WsQueue
 
 
 class App:
@@ -38,6 +41,31 @@ class Echo:
             await websocket.send_text(message)
 
 
+class Failing:
+    async def __call__(self, scope, receive, send):
+        websocket = WebSocket(scope, receive=receive, send=send)
+        await websocket.accept()
+        await websocket.receive()
+        raise ValueError("handler error")
+
+
+class Stuck:
+    async def __call__(self, scope, receive, send):
+        websocket = WebSocket(scope, receive=receive, send=send)
+        await websocket.accept()
+        await asyncio.sleep(10)
+
+
+class Chatty:
+    async def __call__(self, scope, receive, send):
+        websocket = WebSocket(scope, receive=receive, send=send)
+        await websocket.accept()
+        await websocket.receive()  # Wait for the client to start
+        for i in range(20):
+            await websocket.send_text(str(i))
+        await websocket.receive()
+
+
 @pytest.fixture
 def client():
     return TestClient(App)
@@ -103,3 +131,155 @@ async def test_ws_context(client):
     async with client.ws_session("/") as websocket:
         data = await websocket.receive_text()
         assert data == "Hello, world!"
+
+
+@pytest.mark.asyncio
+async def test_close_is_immediate(echo_server):
+    websocket = await echo_server.ws_connect("/")
+    start = time.perf_counter()
+    await websocket.close()
+    assert time.perf_counter() - start < 0.05
+    assert websocket.closed
+    await websocket.close()  # Closing twice is harmless
+
+
+@pytest.mark.asyncio
+async def test_close_raises_handler_error():
+    websocket = await TestClient(Failing()).ws_connect("/")
+    with pytest.raises(ValueError):
+        await websocket.close()
+
+    client = TestClient(Failing(), raise_server_exceptions=False)
+    websocket = await client.ws_connect("/")
+    await websocket.close()
+
+
+@pytest.mark.asyncio
+async def test_close_timeout():
+    websocket = await TestClient(Stuck()).ws_connect("/")
+    with pytest.raises(asyncio.TimeoutError):  # Timeout is a TimeoutError
+        await websocket.close(timeout=0.01)
+    assert websocket._server_task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_close_cancelled():
+    websocket = await TestClient(Stuck()).ws_connect("/")
+    closing = asyncio.ensure_future(websocket.close())
+    await asyncio.sleep(0.01)
+    closing.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await closing
+    assert closing.cancelled()
+    assert websocket._server_task.cancelled()
+
+    websocket = await TestClient(Stuck()).ws_connect("/")
+    websocket._server_task.cancel()
+    await websocket.close()  # Handler cancelled elsewhere
+
+
+@pytest.mark.asyncio
+async def test_close_all(echo_server):
+    sessions = [await echo_server.ws_connect("/") for _ in range(50)]
+    await sessions[0].close()
+
+    start = time.perf_counter()
+    await echo_server.close_all()
+    assert time.perf_counter() - start < 0.1
+    assert all(session.closed for session in sessions)
+    assert all(session._server_task.done() for session in sessions)
+
+
+@pytest.mark.asyncio
+async def test_queue_block():
+    client = TestClient(Chatty(), ws_max_queue=5)
+    websocket = await client.ws_connect("/")
+    await websocket.send_text("go")
+    await asyncio.sleep(0.01)
+    assert websocket._client.qsize() == 5  # App waits for room
+
+    messages = [await websocket.receive_text() for _ in range(20)]
+    assert messages == [str(i) for i in range(20)]
+    assert websocket.queue_stats["client_high_water"] == 5
+    await websocket.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_drop_oldest():
+    client = TestClient(Chatty(), ws_max_queue=5, ws_overflow="drop_oldest")
+    websocket = await client.ws_connect("/")
+    await websocket.send_text("go")
+    await asyncio.sleep(0.01)
+
+    messages = [await websocket.receive_text() for _ in range(5)]
+    assert messages == [str(i) for i in range(15, 20)]
+    assert websocket.queue_stats["client_dropped"] == 15
+    await websocket.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_error():
+    client = TestClient(Chatty(), ws_max_queue=5, ws_overflow="error")
+    websocket = await client.ws_connect("/")
+    await websocket.send_text("go")
+    await asyncio.sleep(0.01)
+    with pytest.raises(asyncio.QueueFull):
+        await websocket.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_block_stalled():
+    async def returned(scope, receive, send):
+        await receive()  # Connect
+        await send({"type": "websocket.accept"})
+
+    websocket = await TestClient(returned, ws_max_queue=1).ws_connect("/")
+    await websocket.send_text("x")
+    await asyncio.wait_for(websocket.close(), 1)  # No disconnect to queue
+
+    client = TestClient(Stuck(), ws_max_queue=1, timeout=0.1)
+    websocket = await client.ws_connect("/")
+    await websocket.send_text("x")
+    with pytest.raises(Timeout):
+        await websocket.send_text("y")
+    with pytest.raises(Timeout):
+        await asyncio.wait_for(websocket.close(), 1)
+    assert websocket._server_task.cancelled()
+
+
+def test_queue_invalid_policy():
+    with pytest.raises(ValueError):
+        WsQueue(1, overflow="nope")
+
+
+@pytest.mark.asyncio
+async def test_send_receive_many(echo_server):
+    websocket = await echo_server.ws_connect("/")
+    messages = [str(i) for i in range(1000)]
+    await websocket.send_many(messages)
+    received = await websocket.receive_many(1000, timeout=1)
+    assert [message["text"] for message in received] == messages
+
+    with pytest.raises(asyncio.TimeoutError):
+        await websocket.receive_many(1, timeout=0.01)
+    await websocket.close()
+
+
+@pytest.mark.asyncio
+async def test_iter_messages(client):
+    websocket = await client.ws_connect("/")
+    messages = [message async for message in websocket]
+    assert [message["text"] for message in messages] == ["Hello, world!"]
+
+
+@pytest.mark.asyncio
+async def test_receive_timeout():
+    client = TestClient(Stuck(), slow_threshold=0.001)
+    websocket = await client.ws_connect("/")
+    with pytest.raises(Timeout, match="a message from the app"):
+        await websocket.receive(timeout=0.01)
+    with pytest.raises(Timeout, match="1 of 1 messages"):
+        await websocket.receive_many(1, timeout=0.01)
+    with pytest.raises(Timeout, match="the handler to return"):
+        await websocket.close(timeout=0.01)
+    assert client.slow_calls[0][0] == "Websocket / receive"